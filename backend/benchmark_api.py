@@ -0,0 +1,86 @@
+"""
+Concurrent load test for the read endpoints of a running API server.
+
+Logs in, then issues a mix of dashboard, candidate, interview and job
+position reads at increasing concurrency levels and prints throughput and
+latency per level. Throughput should keep rising with concurrency while the
+database work happens off the event loop.
+
+    python benchmark_api.py [--base-url http://localhost:8000] [--requests 400] [--concurrency 1 4 16 32]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+READ_PATHS = [
+    "/dashboard/stats",
+    "/candidates?limit=50",
+    "/candidates?limit=20&include_parsed_data=false",
+    "/candidates?skill=python&skill=react&match=all&limit=50",
+    "/interviews?limit=50",
+    "/job-positions",
+]
+
+
+async def run_level(client: httpx.AsyncClient, headers: dict, total: int, concurrency: int) -> dict:
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(READ_PATHS[i % len(READ_PATHS)])
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            path = queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "throughput": len(latencies) / elapsed,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "errors": errors
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@recruitment.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        login = await client.post("/auth/login", json={"email": args.email, "password": args.password})
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        # Warm up connections and caches
+        await run_level(client, headers, len(READ_PATHS) * 2, 1)
+
+        print(f"{'concurrency':>11}  {'req/s':>8}  {'median ms':>10}  {'p95 ms':>8}  errors")
+        for concurrency in args.concurrency:
+            result = await run_level(client, headers, args.requests, concurrency)
+            print(
+                f"{concurrency:>11}  {result['throughput']:>8.1f}  {result['median_ms']:>10.2f}  "
+                f"{result['p95_ms']:>8.2f}  {result['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+Read/write concurrency benchmark for the storage profiles.
+
+Runs writer threads (small insert transactions, like CV ingestion) and reader
+threads (dashboard-style aggregate and listing queries) against a scratch
+SQLite database, once with SQLite's default settings and once with the tuned
+profile, and prints throughput, latency and lock errors for each.
+
+    python benchmark_storage.py [--seconds 5] [--writers 4] [--readers 8] [--rows 20000]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from storage import create_database_engine
+
+SCHEMA = [
+    "CREATE TABLE candidates (id INTEGER PRIMARY KEY, job_position_id INTEGER, status VARCHAR, "
+    "overall_score FLOAT, parsed_data TEXT, uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)",
+    "CREATE INDEX ix_candidates_job_status ON candidates (job_position_id, status, overall_score)",
+]
+
+READ_QUERIES = [
+    "SELECT COUNT(*), AVG(overall_score) FROM candidates",
+    "SELECT status, COUNT(*) FROM candidates GROUP BY status",
+    "SELECT id, overall_score FROM candidates WHERE job_position_id = :job ORDER BY overall_score DESC LIMIT 50",
+]
+
+STATUSES = ["new", "reviewed", "shortlisted", "rejected", "interviewed"]
+
+
+def seed(engine, rows: int):
+    with engine.begin() as connection:
+        for statement in SCHEMA:
+            connection.execute(text(statement))
+        connection.execute(
+            text("INSERT INTO candidates (job_position_id, status, overall_score, parsed_data) VALUES (:job, :status, :score, :data)"),
+            [{"job": i % 20, "status": STATUSES[i % 5], "score": (i * 37) % 100, "data": "x" * 500} for i in range(rows)]
+        )
+
+
+def run_workers(engine, seconds: float, writers: int, readers: int) -> dict:
+    stop = time.perf_counter() + seconds
+    results = {"write": [], "read": [], "errors": 0}
+    lock = threading.Lock()
+
+    def writer(worker: int):
+        latencies, errors, i = [], 0, 0
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                with engine.begin() as connection:
+                    connection.execute(
+                        text("INSERT INTO candidates (job_position_id, status, overall_score, parsed_data) VALUES (:job, 'new', :score, :data)"),
+                        {"job": (worker + i) % 20, "score": i % 100, "data": "y" * 500}
+                    )
+                latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                errors += 1
+            i += 1
+        with lock:
+            results["write"].extend(latencies)
+            results["errors"] += errors
+
+    def reader(worker: int):
+        latencies, errors, i = [], 0, 0
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text(READ_QUERIES[i % len(READ_QUERIES)]), {"job": (worker + i) % 20}).fetchall()
+                latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                errors += 1
+            i += 1
+        with lock:
+            results["read"].extend(latencies)
+            results["errors"] += errors
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def summarize(latencies: list, seconds: float) -> str:
+    if not latencies:
+        return "0 ops"
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"{len(latencies) / seconds:8.0f} ops/s  "
+        f"median {statistics.median(latencies) * 1000:7.2f} ms  p95 {p95 * 1000:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    for profile in ("default", "tuned"):
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_database_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}", profile)
+            seed(engine, args.rows)
+            results = run_workers(engine, args.seconds, args.writers, args.readers)
+            engine.dispose()
+
+        print(f"{profile} profile ({args.writers} writers, {args.readers} readers, {args.seconds:g}s)")
+        print(f"  writes: {summarize(results['write'], args.seconds)}")
+        print(f"  reads:  {summarize(results['read'], args.seconds)}")
+        print(f"  lock errors: {results['errors']}")
+
+
+if __name__ == "__main__":
+    main()
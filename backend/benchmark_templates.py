@@ -0,0 +1,85 @@
+"""
+Micro-benchmark for email template rendering.
+
+Compares the per-message cost of building a jinja2.Template from source on
+every email (how EmailService used to render) with the precompiled
+TemplateRegistry, both per message and through render_many. Also times the
+first load of a template in a fresh registry with a cold and a warm on-disk
+bytecode cache.
+
+    python benchmark_templates.py [--messages 5000] [--template status_update.html]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from jinja2 import Template
+
+from email_service import EMAIL_TEMPLATE_DIR, TemplateRegistry
+
+
+def sample_rows(count: int) -> list:
+    return [
+        {
+            "candidate_name": f"Candidate {i}",
+            "position": f"Position {i % 25}",
+            "status": ("shortlisted", "rejected", "interviewed")[i % 3],
+            "message": "Your application status has been updated.",
+            "interview_date": "Monday, November 02, 2026",
+            "interview_time": f"{9 + i % 8}:00",
+            "interview_type": "video",
+            "meeting_link": f"https://meet.example.com/{i}" if i % 2 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def per_message_us(started: float, count: int) -> float:
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--template", default="status_update.html")
+    args = parser.parse_args()
+
+    with open(os.path.join(EMAIL_TEMPLATE_DIR, args.template)) as f:
+        source = f.read()
+    rows = sample_rows(args.messages)
+
+    started = time.perf_counter()
+    for row in rows:
+        Template(source).render(**row)
+    inline = per_message_us(started, len(rows))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        started = time.perf_counter()
+        TemplateRegistry(cache_directory=cache_dir).get(args.template)
+        cold_ms = (time.perf_counter() - started) * 1000
+
+        registry = TemplateRegistry(cache_directory=cache_dir)
+        started = time.perf_counter()
+        registry.get(args.template)
+        warm_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for row in rows:
+            registry.render(args.template, **row)
+        precompiled = per_message_us(started, len(rows))
+
+        started = time.perf_counter()
+        registry.render_many(args.template, rows)
+        bulk = per_message_us(started, len(rows))
+
+    print(f"{args.template}, {len(rows)} messages")
+    print(f"  inline Template per message: {inline:8.1f} us/message")
+    print(f"  registry.render:             {precompiled:8.1f} us/message  ({inline / precompiled:.0f}x)")
+    print(f"  registry.render_many:        {bulk:8.1f} us/message  ({inline / bulk:.0f}x)")
+    print(f"  first load, cold bytecode cache: {cold_ms:.2f} ms; warm: {warm_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Vectorized candidate scoring for re-scoring a whole job position at once.
+
+Mirrors main.calculate_candidate_score, but works on arrays of candidates:
+skills are a candidates x skills indicator matrix multiplied by the
+requirement weight vector, experience and education use column-wise
+string operations and NumPy selects.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+SKILLS_WEIGHT = 0.5
+EXPERIENCE_WEIGHT = 0.3
+EDUCATION_WEIGHT = 0.2
+
+
+def build_skill_matrix(candidate_skills: List[List[str]], skills: List[str]) -> np.ndarray:
+    """Indicator matrix with a 1 where candidate i lists skill j (case-insensitive)"""
+    columns = {skill.lower(): index for index, skill in enumerate(skills)}
+    matrix = np.zeros((len(candidate_skills), len(skills)), dtype=np.float32)
+    rows, cols = [], []
+    for row, candidate in enumerate(candidate_skills):
+        for skill in candidate:
+            col = columns.get(skill.lower()) if isinstance(skill, str) else None
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    matrix[rows, cols] = 1.0
+    return matrix
+
+
+def skills_scores(candidate_skills: List[List[str]], requirements: List[Dict[str, Any]]) -> np.ndarray:
+    # Repeated requirements for the same skill add up, as in the per-candidate loop
+    weights: Dict[str, float] = {}
+    for req in requirements:
+        if req.get("category") == "skill":
+            key = req["skill"].lower()
+            weights[key] = weights.get(key, 0.0) + req["weight"]
+
+    total_weight = sum(weights.values())
+    if not weights or total_weight <= 0:
+        return np.zeros(len(candidate_skills))
+
+    skills = list(weights)
+    weight_vector = np.array([weights[skill] for skill in skills], dtype=np.float64)
+    matrix = build_skill_matrix(candidate_skills, skills)
+    return matrix @ weight_vector / total_weight * 100
+
+
+def experience_scores(experience: pd.Series) -> np.ndarray:
+    lowered = experience.str.lower()
+    has_year = lowered.str.contains("year", regex=False).to_numpy()
+    years = experience.str.extract(r"(\d+)", expand=False).astype(float).to_numpy()
+    # 15 points per year capped at 100; 50 when "year" is mentioned without a number
+    with_years = np.where(np.isnan(years), 50.0, np.minimum(np.nan_to_num(years) * 15, 100.0))
+    return np.where(has_year, with_years, 30.0)
+
+
+def education_scores(education: pd.Series) -> np.ndarray:
+    lowered = education.str.lower()
+
+    def contains(keyword: str) -> np.ndarray:
+        return lowered.str.contains(keyword, regex=False).to_numpy()
+
+    return np.select(
+        [
+            contains("master") | contains("phd"),
+            contains("bachelor") | contains("degree"),
+            contains("diploma")
+        ],
+        [90.0, 75.0, 60.0],
+        default=40.0
+    )
+
+
+def _text_column(parsed_rows: List[Dict[str, Any]], key: str) -> pd.Series:
+    return pd.Series([row.get(key) if isinstance(row.get(key), str) else "" for row in parsed_rows], dtype=object)
+
+
+def score_candidates(parsed_rows: List[Dict[str, Any]], requirements: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Score many parsed CVs against one job's requirements in a handful of array operations"""
+    count = len(parsed_rows)
+    if not requirements or count == 0:
+        zeros = np.zeros(count)
+        return {
+            "overall_score": zeros,
+            "skills_score": zeros,
+            "experience_score": zeros,
+            "education_score": zeros
+        }
+
+    skills = skills_scores([row.get("skills") or [] for row in parsed_rows], requirements)
+    experience = experience_scores(_text_column(parsed_rows, "experience"))
+    education = education_scores(_text_column(parsed_rows, "education"))
+
+    return {
+        "overall_score": skills * SKILLS_WEIGHT + experience * EXPERIENCE_WEIGHT + education * EDUCATION_WEIGHT,
+        "skills_score": skills,
+        "experience_score": experience,
+        "education_score": education
+    }
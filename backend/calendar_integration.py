@@ -1,18 +1,94 @@
 """
 Calendar integration for Google Calendar and Outlook
+
+The Google Calendar client is built once per CalendarIntegration and reused
+for every event. create_interview_events sends its inserts through the API's
+batch endpoint, up to CALENDAR_BATCH_SIZE per HTTP round trip, and reports a
+result for each event. The transport is an httplib2-compatible `http` object
+and CALENDAR_API_ROOT replaces https://www.googleapis.com/, so both can be
+pointed at a local stub.
 """
 
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
+from googleapiclient.http import BatchHttpRequest
 import os
+import threading
+import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, NamedTuple, Optional, Sequence
+
+CALENDAR_BATCH_SIZE = int(os.getenv("CALENDAR_BATCH_SIZE", "50"))  # the Calendar API's limit per batch request
+CALENDAR_API_ROOT = os.getenv("CALENDAR_API_ROOT", "")  # empty for https://www.googleapis.com/
+
+
+class InterviewEvent(NamedTuple):
+    candidate_name: str
+    interviewer_email: str
+    candidate_email: str
+    start_time: datetime
+    duration_minutes: int = 60
+    position: str = ""
+
+
+class EventResult(NamedTuple):
+    event_id: Optional[str]
+    error: Optional[str] = None
+
+
+def google_event_body(event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Google Calendar event resource for an event_data dict"""
+    event = {
+        'summary': event_data['title'],
+        'description': event_data.get('description', ''),
+        'start': {
+            'dateTime': event_data['start_time'],
+            'timeZone': 'UTC',
+        },
+        'end': {
+            'dateTime': event_data['end_time'],
+            'timeZone': 'UTC',
+        },
+        'attendees': [
+            {'email': email} for email in event_data.get('attendees', [])
+        ]
+    }
+    if event_data.get('create_meet_link'):
+        # Unique per event: requests in one batch share a timestamp, and a reused ID returns the same conference
+        event['conferenceData'] = {
+            'createRequest': {
+                'requestId': f"interview-{uuid.uuid4().hex}",
+                'conferenceSolutionKey': {'type': 'hangoutsMeet'}
+            }
+        }
+    return event
+
+
+def interview_event_data(interview: InterviewEvent) -> Dict[str, Any]:
+    end_time = interview.start_time + timedelta(minutes=interview.duration_minutes)
+    return {
+        'title': f'Interview: {interview.candidate_name} - {interview.position}',
+        'description': f'Interview with {interview.candidate_name} for the position of {interview.position}',
+        'start_time': interview.start_time.isoformat(),
+        'end_time': end_time.isoformat(),
+        'attendees': [interview.interviewer_email, interview.candidate_email],
+        'create_meet_link': True
+    }
+
 
 class CalendarIntegration:
-    def __init__(self):
-        self.google_credentials = None
+    def __init__(self, credentials: Optional[Credentials] = None, http=None,
+                 api_root: str = CALENDAR_API_ROOT, batch_size: int = CALENDAR_BATCH_SIZE):
+        self.google_credentials = credentials
         self.outlook_credentials = None
+        self.http = http  # used instead of an authorized transport built from the credentials
+        self.api_root = api_root
+        self.batch_size = batch_size
+        # httplib2 transports are not thread-safe, so calls through the shared client are serialised
+        self._lock = threading.RLock()
+        self._service = None
+        self._service_credentials = None
     
     def setup_google_calendar(self, credentials_file: str):
         """Setup Google Calendar integration"""
@@ -32,38 +108,34 @@ class CalendarIntegration:
             print(f"Error setting up Google Calendar: {e}")
             return False
     
+    def google_service(self):
+        """The Calendar API client, built on first use and again only if the credentials change"""
+        with self._lock:
+            if self._service is None or self._service_credentials is not self.google_credentials:
+                options = {'api_endpoint': f"{self.api_root}calendar/v3/"} if self.api_root else None
+                # The discovery document ships with the client library, so this makes no request
+                if self.http is not None:
+                    self._service = build('calendar', 'v3', http=self.http, client_options=options,
+                                          static_discovery=True)
+                else:
+                    self._service = build('calendar', 'v3', credentials=self.google_credentials,
+                                          client_options=options, static_discovery=True)
+                self._service_credentials = self.google_credentials
+            return self._service
+    
+    def _insert_request(self, service, event_data: Dict[str, Any]):
+        return service.events().insert(
+            calendarId='primary',
+            body=google_event_body(event_data),
+            conferenceDataVersion=1 if event_data.get('create_meet_link') else 0
+        )
+    
     def create_google_calendar_event(self, event_data: Dict[str, Any]) -> Optional[str]:
         """Create a Google Calendar event"""
         try:
-            service = build('calendar', 'v3', credentials=self.google_credentials)
-            
-            event = {
-                'summary': event_data['title'],
-                'description': event_data.get('description', ''),
-                'start': {
-                    'dateTime': event_data['start_time'],
-                    'timeZone': 'UTC',
-                },
-                'end': {
-                    'dateTime': event_data['end_time'],
-                    'timeZone': 'UTC',
-                },
-                'attendees': [
-                    {'email': email} for email in event_data.get('attendees', [])
-                ],
-                'conferenceData': {
-                    'createRequest': {
-                        'requestId': f"interview-{datetime.now().timestamp()}",
-                        'conferenceSolutionKey': {'type': 'hangoutsMeet'}
-                    }
-                } if event_data.get('create_meet_link') else None
-            }
-            
-            created_event = service.events().insert(
-                calendarId='primary',
-                body=event,
-                conferenceDataVersion=1 if event_data.get('create_meet_link') else 0
-            ).execute()
+            with self._lock:
+                service = self.google_service()
+                created_event = self._insert_request(service, event_data).execute()
             
             return created_event.get('id')
             
@@ -71,26 +143,59 @@ class CalendarIntegration:
             print(f"Error creating Google Calendar event: {e}")
             return None
     
+    def create_google_calendar_events(self, events_data: Sequence[Dict[str, Any]]) -> List[EventResult]:
+        """Create several events with batch requests; one EventResult per event, in order"""
+        results: List[Optional[EventResult]] = [None] * len(events_data)
+        
+        def record(request_id: str, response: Optional[Dict[str, Any]], exception: Optional[Exception]):
+            if exception is not None:
+                results[int(request_id)] = EventResult(None, str(exception) or type(exception).__name__)
+            else:
+                results[int(request_id)] = EventResult(response.get('id'))
+        
+        for start in range(0, len(events_data), self.batch_size):
+            chunk = range(start, min(start + self.batch_size, len(events_data)))
+            try:
+                with self._lock:
+                    service = self.google_service()
+                    batch = self._new_batch(service, record)
+                    for index in chunk:
+                        batch.add(self._insert_request(service, events_data[index]), request_id=str(index))
+                    batch.execute()
+            except Exception as e:
+                print(f"Error creating Google Calendar events: {e}")
+                for index in chunk:
+                    if results[index] is None:
+                        results[index] = EventResult(None, str(e) or type(e).__name__)
+        
+        return [result or EventResult(None, "No response for this event") for result in results]
+    
+    def _new_batch(self, service, callback) -> BatchHttpRequest:
+        if self.api_root:
+            # new_batch_http_request() would still post to the discovery document's rootUrl
+            return BatchHttpRequest(callback=callback, batch_uri=f"{self.api_root}batch/calendar/v3")
+        return service.new_batch_http_request(callback=callback)
+    
     def create_interview_event(self, candidate_name: str, interviewer_email: str,
                              candidate_email: str, start_time: datetime,
                              duration_minutes: int = 60, position: str = "") -> Optional[str]:
         """Create an interview calendar event"""
         
-        end_time = start_time + timedelta(minutes=duration_minutes)
-        
-        event_data = {
-            'title': f'Interview: {candidate_name} - {position}',
-            'description': f'Interview with {candidate_name} for the position of {position}',
-            'start_time': start_time.isoformat(),
-            'end_time': end_time.isoformat(),
-            'attendees': [interviewer_email, candidate_email],
-            'create_meet_link': True
-        }
+        event_data = interview_event_data(InterviewEvent(
+            candidate_name, interviewer_email, candidate_email, start_time, duration_minutes, position
+        ))
         
         return self.create_google_calendar_event(event_data)
+    
+    def create_interview_events(self, batch: Sequence[InterviewEvent]) -> List[EventResult]:
+        """Create interview calendar events in batch requests, e.g. for a panel day"""
+        return self.create_google_calendar_events([interview_event_data(interview) for interview in batch])
 
 # Usage in main.py - add these endpoints
 """
+# One instance for the process, so the API client is built once
+calendar_service = CalendarIntegration()
+
 @app.post("/calendar/create-interview-event")
 async def create_interview_calendar_event(
     interview_id: int,
@@ -105,8 +210,6 @@ async def create_interview_calendar_event(
     interviewer = db.query(User).filter(User.id == interview.interviewer_id).first()
     job_position = db.query(JobPosition).filter(JobPosition.id == candidate.job_position_id).first()
     
-    calendar_service = CalendarIntegration()
-    
     event_id = calendar_service.create_interview_event(
         candidate_name=candidate.name,
         interviewer_email=interviewer.email,
@@ -120,4 +223,31 @@ async def create_interview_calendar_event(
         return {"message": "Calendar event created successfully", "event_id": event_id}
     else:
         raise HTTPException(status_code=500, detail="Failed to create calendar event")
+
+@app.post("/calendar/create-interview-events")
+async def create_interview_calendar_events(
+    interview_ids: List[int],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    interviews = db.query(Interview).filter(Interview.id.in_(interview_ids)).all()
+    batch = [
+        InterviewEvent(
+            candidate_name=interview.candidate.name,
+            interviewer_email=interview.interviewer.email,
+            candidate_email=interview.candidate.email,
+            start_time=interview.scheduled_date,
+            duration_minutes=interview.duration,
+            position=interview.candidate.job_position.title if interview.candidate.job_position else ""
+        )
+        for interview in interviews
+    ]
+    
+    # Blocking HTTP; run it off the event loop
+    results = await run_in_threadpool(calendar_service.create_interview_events, batch)
+    
+    return [
+        {"interview_id": interview.id, "event_id": result.event_id, "error": result.error}
+        for interview, result in zip(interviews, results)
+    ]
 """
@@ -4,19 +4,44 @@ Advanced CV parsing utilities
 
 import re
 import json
-from typing import Dict, List, Any
-import spacy
+import threading
+from typing import Dict, List, Any, Optional
 from datetime import datetime
+from skill_matcher import SkillMatcher
 
-# Load spaCy model (install with: python -m spacy download en_core_web_sm)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("spaCy model not found. Install with: python -m spacy download en_core_web_sm")
-    nlp = None
+# spaCy model (install with: python -m spacy download en_core_web_sm)
+SPACY_MODEL = "en_core_web_sm"
+# Only PERSON entities are needed, so everything but NER is left out of the pipeline. The shared
+# tok2vec only feeds the tagger and parser: en_core_web_sm's NER embeds its own copy, so it goes too
+SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+NAME_SCAN_CHARS = 500
+
+_nlp = None
+_nlp_loaded = False
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """Load the spaCy model on first use; returns None when spaCy or the model is unavailable"""
+    global _nlp, _nlp_loaded
+    if not _nlp_loaded:
+        with _nlp_lock:
+            if not _nlp_loaded:
+                try:
+                    import spacy
+                    _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+                except (ImportError, OSError):
+                    print("spaCy model not found. Install with: python -m spacy download en_core_web_sm")
+                    _nlp = None
+                _nlp_loaded = True
+    return _nlp
 
 class AdvancedCVParser:
-    def __init__(self):
+    def __init__(self, use_spacy: bool = True, batch_size: int = 64, n_process: int = 1):
+        # use_spacy=False is the fast mode: names come from the line heuristic only
+        self.use_spacy = use_spacy
+        self.batch_size = batch_size
+        self.n_process = n_process
+        
         self.skill_keywords = {
             "programming": [
                 "Python", "JavaScript", "Java", "C++", "C#", "Go", "Rust", "Swift", "Kotlin",
@@ -54,6 +79,14 @@ class AdvancedCVParser:
             "bachelors": ["bachelor", "bsc", "b.sc", "ba", "b.a", "be", "b.e", "btech", "b.tech"],
             "diploma": ["diploma", "certificate", "associate"]
         }
+        
+        # One automaton over the whole vocabulary instead of a substring scan per keyword
+        self.skill_categories = {
+            skill: category
+            for category, skills in self.skill_keywords.items()
+            for skill in skills
+        }
+        self.skill_matcher = SkillMatcher({skill: [skill] for skill in self.skill_categories})
     
     def extract_contact_info(self, text: str) -> Dict[str, str]:
         """Extract contact information from CV text"""
@@ -100,13 +133,10 @@ class AdvancedCVParser:
     
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
         """Extract skills categorized by type"""
-        text_upper = text.upper()
         found_skills = {category: [] for category in self.skill_keywords}
         
-        for category, skills in self.skill_keywords.items():
-            for skill in skills:
-                if skill.upper() in text_upper:
-                    found_skills[category].append(skill)
+        for skill in self.skill_matcher.find_skills(text):
+            found_skills[self.skill_categories[skill]].append(skill)
         
         # Remove empty categories
         return {k: v for k, v in found_skills.items() if v}
@@ -186,13 +216,41 @@ class AdvancedCVParser:
     
     def extract_name(self, text: str) -> str:
         """Extract candidate name from CV"""
+        nlp = get_nlp() if self.use_spacy else None
         if nlp:
-            doc = nlp(text[:500])  # Process first 500 characters
-            for ent in doc.ents:
-                if ent.label_ == "PERSON":
-                    return ent.text
+            name = self._person_from_doc(nlp(text[:NAME_SCAN_CHARS]))
+            if name:
+                return name
         
-        # Fallback: look for name in first few lines
+        return self.extract_name_heuristic(text)
+    
+    def extract_names(self, texts: List[str], batch_size: Optional[int] = None,
+                      n_process: Optional[int] = None) -> List[str]:
+        """Extract candidate names for many CVs, batching them through nlp.pipe"""
+        nlp = get_nlp() if self.use_spacy else None
+        if not nlp:
+            return [self.extract_name_heuristic(text) for text in texts]
+        
+        docs = nlp.pipe(
+            (text[:NAME_SCAN_CHARS] for text in texts),
+            batch_size=batch_size or self.batch_size,
+            n_process=n_process or self.n_process
+        )
+        return [
+            self._person_from_doc(doc) or self.extract_name_heuristic(text)
+            for text, doc in zip(texts, docs)
+        ]
+    
+    @staticmethod
+    def _person_from_doc(doc) -> Optional[str]:
+        for ent in doc.ents:
+            if ent.label_ == "PERSON":
+                return ent.text
+        return None
+    
+    @staticmethod
+    def extract_name_heuristic(text: str) -> str:
+        """Fast name extraction: look for a name-like line in the first few lines"""
         lines = text.split('\n')
         for line in lines[:5]:
             line = line.strip()
@@ -203,10 +261,10 @@ class AdvancedCVParser:
         
         return "Unknown"
     
-    def parse_cv(self, text: str) -> Dict[str, Any]:
+    def parse_cv(self, text: str, name: Optional[str] = None) -> Dict[str, Any]:
         """Main parsing function that combines all extraction methods"""
         parsed_data = {
-            "name": self.extract_name(text),
+            "name": name if name is not None else self.extract_name(text),
             "contact": self.extract_contact_info(text),
             "skills": self.extract_skills(text),
             "experience": self.extract_experience(text),
@@ -216,6 +274,12 @@ class AdvancedCVParser:
         }
         
         return parsed_data
+    
+    def parse_cvs(self, texts: List[str], batch_size: Optional[int] = None,
+                  n_process: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Parse many CVs at once, extracting names in spaCy batches"""
+        names = self.extract_names(texts, batch_size, n_process)
+        return [self.parse_cv(text, name=name) for text, name in zip(texts, names)]
 
 # Scoring algorithm
 class CandidateScorer:
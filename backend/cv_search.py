@@ -0,0 +1,107 @@
+"""
+Full-text search over extracted CV text (SQLite FTS5).
+
+candidates_fts is an external-content FTS5 index over candidates.name and
+candidates.cv_text, kept in sync by triggers, so the text is stored once and
+every write path (ORM, bulk SQL, scripts) updates the index. Searches rank
+by BM25 and page with a (score, id) cursor; snippets are only built for the
+rows on the returned page.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+
+SNIPPET_TOKENS = 16
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+
+# Re-reads every row of candidates. Needed after writes the triggers miss: INSERT OR REPLACE deletes
+# the old row without firing the delete trigger (recursive_triggers is off), which corrupts the index
+REBUILD_STATEMENT = "INSERT INTO candidates_fts (candidates_fts) VALUES ('rebuild')"
+
+SCHEMA_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5("
+    "name, cv_text, content='candidates', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS candidates_fts_insert AFTER INSERT ON candidates BEGIN "
+    "INSERT INTO candidates_fts (rowid, name, cv_text) VALUES (new.id, new.name, new.cv_text); END",
+    "CREATE TRIGGER IF NOT EXISTS candidates_fts_delete AFTER DELETE ON candidates BEGIN "
+    "INSERT INTO candidates_fts (candidates_fts, rowid, name, cv_text) VALUES ('delete', old.id, old.name, old.cv_text); END",
+    "CREATE TRIGGER IF NOT EXISTS candidates_fts_update AFTER UPDATE OF name, cv_text ON candidates BEGIN "
+    "INSERT INTO candidates_fts (candidates_fts, rowid, name, cv_text) VALUES ('delete', old.id, old.name, old.cv_text); "
+    "INSERT INTO candidates_fts (rowid, name, cv_text) VALUES (new.id, new.name, new.cv_text); END",
+    # Index whatever is already in candidates
+    REBUILD_STATEMENT,
+]
+
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def create_search_index(connection: Connection):
+    for statement in SCHEMA_STATEMENTS:
+        connection.execute(text(statement))
+
+
+def fts_query(query: str) -> str:
+    """Turn a free-text query into an FTS5 expression that matches every term.
+
+    Each word (or "quoted phrase") becomes an FTS5 phrase, so punctuation such
+    as "on-call" or "C++" never trips the FTS5 query syntax; a trailing * keeps
+    prefix matching.
+    """
+    terms = []
+    for phrase, word in _TERM.findall(query):
+        term = phrase or word
+        prefix = term.endswith("*") and not phrase
+        term = term.rstrip("*") if prefix else term
+        if not term.strip():
+            continue
+        terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search_candidates(connection: Connection, query: str, job_position_id: Optional[int] = None,
+                      limit: int = 50, after: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+    """Return up to `limit` matching candidates ordered by BM25 (best first), after a (score, id) cursor"""
+    match = fts_query(query)
+    if not match:
+        return []
+
+    params: Dict[str, Any] = {"match": match, "limit": limit}
+    source = "candidates_fts"
+    job_filter = ""
+    if job_position_id is not None:
+        # Only join candidates when filtering; unfiltered searches never touch the base table
+        source = "candidates_fts JOIN candidates ON candidates.id = candidates_fts.rowid"
+        job_filter = "AND candidates.job_position_id = :job_position_id"
+        params["job_position_id"] = job_position_id
+    keyset = ""
+    if after is not None:
+        keyset = "WHERE (score, id) > (:after_score, :after_id)"
+        params["after_score"], params["after_id"] = after
+
+    # bm25() is lower for better matches
+    ranked = connection.execute(text(
+        f"SELECT id, score FROM ("
+        f"SELECT candidates_fts.rowid AS id, bm25(candidates_fts) AS score "
+        f"FROM {source} WHERE candidates_fts MATCH :match {job_filter}"
+        f") {keyset} ORDER BY score, id LIMIT :limit"
+    ), params).all()
+    if not ranked:
+        return []
+
+    details = connection.execute(
+        text(
+            "SELECT candidates.id, candidates.name, candidates.email, candidates.job_position_id, "
+            "candidates.overall_score, candidates.status, candidates.uploaded_at, "
+            f"snippet(candidates_fts, 1, '{SNIPPET_START}', '{SNIPPET_END}', '...', {SNIPPET_TOKENS}) AS snippet "
+            "FROM candidates_fts JOIN candidates ON candidates.id = candidates_fts.rowid "
+            "WHERE candidates_fts MATCH :match AND candidates_fts.rowid IN :ids"
+        ).bindparams(bindparam("ids", expanding=True)),
+        {"match": match, "ids": [row.id for row in ranked]}
+    ).mappings().all()
+    by_id = {row["id"]: row for row in details}
+
+    return [dict(by_id[row.id], score=row.score) for row in ranked if row.id in by_id]
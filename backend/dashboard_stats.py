@@ -0,0 +1,147 @@
+"""
+Incrementally maintained dashboard aggregates.
+
+dashboard_stats holds one row per job position plus a global row
+(job_position_id = 0) with candidate counts, the score sum, candidate
+status buckets and interview counts. Writers add signed deltas inside
+their own transaction, so /dashboard/stats is a primary-key read instead
+of a scan; rebuild_dashboard_stats recomputes everything from the base
+tables for existing databases or after out-of-band writes.
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+GLOBAL_SCOPE = 0
+
+CANDIDATE_STATUS_COLUMNS = {
+    "new": "new_candidates",
+    "reviewed": "reviewed_candidates",
+    "shortlisted": "shortlisted_candidates",
+    "rejected": "rejected_candidates",
+    "interviewed": "interviewed_candidates",
+}
+
+STAT_COLUMNS = [
+    "total_candidates",
+    "score_sum",
+    *CANDIDATE_STATUS_COLUMNS.values(),
+    "total_interviews",
+    "scheduled_interviews",
+    "active_jobs",
+]
+
+
+class DashboardDeltas:
+    """Signed changes to dashboard_stats, grouped by scope (job position ID or GLOBAL_SCOPE)"""
+
+    def __init__(self):
+        self.changes: Dict[int, Counter] = defaultdict(Counter)
+
+    def _add(self, job_position_id: Optional[int], column: str, value: float):
+        self.changes[GLOBAL_SCOPE][column] += value
+        if job_position_id is not None:
+            self.changes[job_position_id][column] += value
+
+    def add_candidate(self, job_position_id: Optional[int], status: Optional[str],
+                      score: Optional[float], sign: int = 1):
+        self._add(job_position_id, "total_candidates", sign)
+        self._add(job_position_id, "score_sum", sign * (score or 0.0))
+        column = CANDIDATE_STATUS_COLUMNS.get(status or "new")
+        if column:
+            self._add(job_position_id, column, sign)
+
+    def add_interview(self, job_position_id: Optional[int], status: Optional[str], sign: int = 1):
+        self._add(job_position_id, "total_interviews", sign)
+        if (status or "scheduled") == "scheduled":
+            self._add(job_position_id, "scheduled_interviews", sign)
+
+    def add_job_position(self, status: Optional[str], sign: int = 1):
+        if (status or "active") == "active":
+            self.changes[GLOBAL_SCOPE]["active_jobs"] += sign
+
+    def add_score(self, job_position_id: Optional[int], delta: float):
+        self._add(job_position_id, "score_sum", delta)
+
+    def apply(self, connection: Connection):
+        """Add the deltas to dashboard_stats, creating missing scope rows"""
+        now = datetime.utcnow()
+        for scope, changes in self.changes.items():
+            changes = {column: value for column, value in changes.items() if value}
+            if not changes:
+                continue
+
+            assignments = ", ".join(f"{column} = {column} + :{column}" for column in changes)
+            updated = connection.execute(
+                text(f"UPDATE dashboard_stats SET {assignments}, updated_at = :updated_at WHERE job_position_id = :scope"),
+                {**changes, "updated_at": now, "scope": scope}
+            )
+            if updated.rowcount == 0:
+                values = {column: changes.get(column, 0) for column in STAT_COLUMNS}
+                connection.execute(
+                    text(
+                        f"INSERT INTO dashboard_stats (job_position_id, {', '.join(STAT_COLUMNS)}, updated_at) "
+                        f"VALUES (:scope, {', '.join(':' + column for column in STAT_COLUMNS)}, :updated_at)"
+                    ),
+                    {**values, "updated_at": now, "scope": scope}
+                )
+        self.changes.clear()
+
+
+def _candidate_aggregates(where: str) -> str:
+    buckets = ", ".join(
+        f"COUNT(CASE WHEN COALESCE(status, 'new') = '{status}' THEN 1 END)"
+        for status in CANDIDATE_STATUS_COLUMNS
+    )
+    return f"COUNT(*), COALESCE(SUM(overall_score), 0), {buckets} FROM candidates {where}"
+
+
+def _interview_counts(job_filter: str) -> str:
+    return (
+        "total_interviews = (SELECT COUNT(*) FROM interviews JOIN candidates ON candidates.id = interviews.candidate_id "
+        f"WHERE {job_filter}), "
+        "scheduled_interviews = (SELECT COUNT(*) FROM interviews JOIN candidates ON candidates.id = interviews.candidate_id "
+        f"WHERE {job_filter} AND COALESCE(interviews.status, 'scheduled') = 'scheduled')"
+    )
+
+
+# Plain SQL so scripts that bypass the ORM (database_init.py) can run them too
+_candidate_columns = ", ".join(["total_candidates", "score_sum", *CANDIDATE_STATUS_COLUMNS.values()])
+REBUILD_STATEMENTS = [
+    "DELETE FROM dashboard_stats",
+    f"INSERT INTO dashboard_stats (job_position_id, {_candidate_columns}) "
+    f"SELECT job_position_id, {_candidate_aggregates('WHERE job_position_id IS NOT NULL GROUP BY job_position_id')}",
+    f"INSERT INTO dashboard_stats (job_position_id, {_candidate_columns}) "
+    f"SELECT {GLOBAL_SCOPE}, {_candidate_aggregates('')}",
+    f"UPDATE dashboard_stats SET {_interview_counts('candidates.job_position_id = dashboard_stats.job_position_id')}, "
+    f"active_jobs = 0 WHERE job_position_id != {GLOBAL_SCOPE}",
+    # Interviews whose candidate has no position (or no longer exists) still count globally
+    "UPDATE dashboard_stats SET total_interviews = (SELECT COUNT(*) FROM interviews), "
+    "scheduled_interviews = (SELECT COUNT(*) FROM interviews WHERE COALESCE(status, 'scheduled') = 'scheduled'), "
+    "active_jobs = (SELECT COUNT(*) FROM job_positions WHERE COALESCE(status, 'active') = 'active') "
+    f"WHERE job_position_id = {GLOBAL_SCOPE}",
+    "UPDATE dashboard_stats SET updated_at = CURRENT_TIMESTAMP",
+]
+
+
+# Same columns as main.DashboardStats; lets migrations create the table without the app's create_all
+dashboard_stats_table = Table(
+    "dashboard_stats", MetaData(),
+    Column("job_position_id", Integer, primary_key=True, autoincrement=False),
+    *(Column(name, Float if name == "score_sum" else Integer, nullable=False, server_default="0") for name in STAT_COLUMNS),
+    Column("updated_at", DateTime),
+)
+
+
+def create_dashboard_stats_table(connection: Connection):
+    dashboard_stats_table.create(connection, checkfirst=True)
+
+
+def rebuild_dashboard_stats(connection: Connection):
+    """Recompute every dashboard_stats row from the base tables"""
+    for statement in REBUILD_STATEMENTS:
+        connection.execute(text(statement))
@@ -7,26 +7,32 @@ import sqlite3
 import json
 from datetime import datetime, timedelta
 import hashlib
+from dashboard_stats import REBUILD_STATEMENTS
+from cv_search import REBUILD_STATEMENT as REBUILD_SEARCH_INDEX
 
 def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode()).hexdigest()
 
+def db_timestamp(value: datetime) -> str:
+    """Format a datetime the way SQLAlchemy stores it in SQLite, so seeded rows sort and compare with API rows"""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
 def init_database():
     conn = sqlite3.connect('recruitment.db')
     cursor = conn.cursor()
     
     # Sample users
     users_data = [
-        (1, "System Administrator", "admin@recruitment.com", hash_password("admin123"), "admin", "active", datetime.utcnow().isoformat(), None, json.dumps(["full_access", "user_management", "system_config"])),
-        (2, "John Smith", "john.smith@company.com", hash_password("password123"), "recruiter", "active", datetime.utcnow().isoformat(), datetime.utcnow().isoformat(), json.dumps(["cv_upload", "candidate_review", "interview_schedule"])),
-        (3, "Jane Doe", "jane.doe@company.com", hash_password("password123"), "hiring_manager", "active", datetime.utcnow().isoformat(), datetime.utcnow().isoformat(), json.dumps(["candidate_review", "interview_schedule", "final_decision"])),
+        (1, "System Administrator", "admin@recruitment.com", hash_password("admin123"), "admin", "active", db_timestamp(datetime.utcnow()), None, json.dumps(["full_access", "user_management", "system_config"])),
+        (2, "John Smith", "john.smith@company.com", hash_password("password123"), "recruiter", "active", db_timestamp(datetime.utcnow()), db_timestamp(datetime.utcnow()), json.dumps(["cv_upload", "candidate_review", "interview_schedule"])),
+        (3, "Jane Doe", "jane.doe@company.com", hash_password("password123"), "hiring_manager", "active", db_timestamp(datetime.utcnow()), db_timestamp(datetime.utcnow()), json.dumps(["candidate_review", "interview_schedule", "final_decision"])),
     ]
     
     # Sample job positions
     job_positions_data = [
-        (1, "Senior Frontend Developer", "Engineering", "Remote", "We are looking for an experienced frontend developer to join our team.", "active", datetime.utcnow().isoformat(), 1),
-        (2, "Data Scientist", "Analytics", "New York", "Join our data science team to build ML models and analytics solutions.", "active", datetime.utcnow().isoformat(), 1),
-        (3, "UX Designer", "Design", "San Francisco", "Create amazing user experiences for our products.", "active", datetime.utcnow().isoformat(), 1),
+        (1, "Senior Frontend Developer", "Engineering", "Remote", "We are looking for an experienced frontend developer to join our team.", "active", db_timestamp(datetime.utcnow()), 1),
+        (2, "Data Scientist", "Analytics", "New York", "Join our data science team to build ML models and analytics solutions.", "active", db_timestamp(datetime.utcnow()), 1),
+        (3, "UX Designer", "Design", "San Francisco", "Create amazing user experiences for our products.", "active", db_timestamp(datetime.utcnow()), 1),
     ]
     
     # Sample job requirements
@@ -63,7 +69,7 @@ def init_database():
              "experience": "6 years",
              "education": "Bachelor's in Computer Science",
              "summary": "Experienced frontend developer with strong React skills"
-         }), 92.0, 95.0, 88.0, 85.0, "shortlisted", datetime.utcnow().isoformat()),
+         }), 92.0, 95.0, 88.0, 85.0, "shortlisted", db_timestamp(datetime.utcnow())),
         
         (2, "Michael Chen", "michael.chen@email.com", "+1-555-0102", 1, "uploads/michael_cv.pdf",
          json.dumps({
@@ -74,7 +80,7 @@ def init_database():
              "experience": "5 years",
              "education": "Master's in Software Engineering",
              "summary": "Full-stack developer with multi-framework experience"
-         }), 88.0, 90.0, 85.0, 90.0, "reviewed", datetime.utcnow().isoformat()),
+         }), 88.0, 90.0, 85.0, 90.0, "reviewed", db_timestamp(datetime.utcnow())),
         
         (3, "Emily Rodriguez", "emily.rodriguez@email.com", "+1-555-0103", 1, "uploads/emily_cv.pdf",
          json.dumps({
@@ -85,7 +91,7 @@ def init_database():
              "experience": "7 years",
              "education": "Bachelor's in Information Technology",
              "summary": "Senior developer with team leadership experience"
-         }), 85.0, 82.0, 90.0, 80.0, "new", datetime.utcnow().isoformat()),
+         }), 85.0, 82.0, 90.0, 80.0, "new", db_timestamp(datetime.utcnow())),
         
         (4, "David Kim", "david.kim@email.com", "+1-555-0104", 1, "uploads/david_cv.pdf",
          json.dumps({
@@ -96,7 +102,7 @@ def init_database():
              "experience": "4 years",
              "education": "Bachelor's in Computer Science",
              "summary": "Frontend developer with solid fundamentals"
-         }), 78.0, 75.0, 80.0, 85.0, "new", datetime.utcnow().isoformat()),
+         }), 78.0, 75.0, 80.0, 85.0, "new", db_timestamp(datetime.utcnow())),
         
         (5, "Dr. Lisa Wang", "lisa.wang@email.com", "+1-555-0105", 2, "uploads/lisa_cv.pdf",
          json.dumps({
@@ -107,14 +113,14 @@ def init_database():
              "experience": "8 years",
              "education": "PhD in Data Science",
              "summary": "Senior data scientist with extensive ML experience"
-         }), 94.0, 96.0, 92.0, 95.0, "shortlisted", datetime.utcnow().isoformat()),
+         }), 94.0, 96.0, 92.0, 95.0, "shortlisted", db_timestamp(datetime.utcnow())),
     ]
     
     # Sample interviews
     interviews_data = [
-        (1, 1, 2, (datetime.utcnow() + timedelta(days=2)).isoformat(), 60, "video", None, "Technical interview focusing on React and TypeScript", "scheduled", datetime.utcnow().isoformat()),
-        (2, 2, 3, (datetime.utcnow() + timedelta(days=4)).isoformat(), 45, "video", None, "Initial screening call", "confirmed", datetime.utcnow().isoformat()),
-        (3, 5, 2, (datetime.utcnow() + timedelta(days=1)).isoformat(), 90, "video", None, "Technical interview for data science role", "scheduled", datetime.utcnow().isoformat()),
+        (1, 1, 2, db_timestamp(datetime.utcnow() + timedelta(days=2)), 60, "video", None, "Technical interview focusing on React and TypeScript", "scheduled", db_timestamp(datetime.utcnow())),
+        (2, 2, 3, db_timestamp(datetime.utcnow() + timedelta(days=4)), 45, "video", None, "Initial screening call", "confirmed", db_timestamp(datetime.utcnow())),
+        (3, 5, 2, db_timestamp(datetime.utcnow() + timedelta(days=1)), 90, "video", None, "Technical interview for data science role", "scheduled", db_timestamp(datetime.utcnow())),
     ]
     
     try:
@@ -144,6 +150,16 @@ def init_database():
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, interviews_data)
         
+        # Rows above bypass the API, so recompute the dashboard counters from them; before the API
+        # has ever run the table does not exist yet and migration 2 seeds it from these rows instead
+        if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'dashboard_stats'").fetchone():
+            for statement in REBUILD_STATEMENTS:
+                cursor.execute(statement)
+        
+        # INSERT OR REPLACE skips the candidates_fts delete trigger, so re-index the replaced rows
+        if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'candidates_fts'").fetchone():
+            cursor.execute(REBUILD_SEARCH_INDEX)
+        
         conn.commit()
         print("Database initialized successfully with sample data!")
         print("\nDefault login credentials:")
@@ -0,0 +1,110 @@
+"""
+Near-duplicate CV detection with MinHash and banded LSH.
+
+A CV's text is reduced to overlapping word shingles, and a MinHash
+signature of NUM_PERMUTATIONS 32-bit values (512 bytes) estimates the
+Jaccard similarity of two CVs as the fraction of positions where their
+signatures agree. The signature is cut into LSH_BANDS bands of LSH_ROWS
+values and each band is hashed to a bucket stored in candidate_lsh_buckets,
+so finding likely duplicates is an index lookup on 16 (band, bucket) keys
+instead of a comparison with every CV. Pairs sharing a bucket are confirmed
+against DUPLICATE_THRESHOLD using the full signatures.
+
+With 16 bands of 8 rows, two CVs share at least one bucket with probability
+1 - (1 - s^8)^16: about 0.99 at s = 0.85, 0.5 at s = 0.7 and 0.01 at s = 0.4.
+"""
+
+import hashlib
+import re
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+SHINGLE_SIZE = 3  # words
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+DUPLICATE_THRESHOLD = 0.8
+
+_PRIME = (1 << 31) - 1
+# Fixed seed: signatures are persisted and must stay comparable across processes and restarts
+_random = np.random.RandomState(20240101)
+_A = _random.randint(1, _PRIME, NUM_PERMUTATIONS).astype(np.uint64)[:, None]
+_B = _random.randint(0, _PRIME, NUM_PERMUTATIONS).astype(np.uint64)[:, None]
+
+_WORD = re.compile(r"\w+")
+
+
+def shingle_hashes(cv_text: str) -> np.ndarray:
+    words = _WORD.findall(cv_text.lower())
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(len(words) - SHINGLE_SIZE + 1, 1))}
+    shingles.discard("")
+    return np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signature(cv_text: Optional[str]) -> bytes:
+    """MinHash signature of a CV's text; empty when the text has no words"""
+    hashes = shingle_hashes(cv_text or "")
+    if len(hashes) == 0:
+        return b""
+    # (a * x + b) mod p with a < 2^31 and x < 2^32 stays within 64 bits
+    return ((_A * hashes + _B) % _PRIME).min(axis=1).astype("<u4").tobytes()
+
+
+def _values(signature: bytes) -> np.ndarray:
+    return np.frombuffer(signature, dtype="<u4")
+
+
+def lsh_buckets(signature: bytes) -> List[Tuple[int, int]]:
+    """(band, bucket) keys of a signature; none for an empty signature"""
+    if not signature:
+        return []
+    values = _values(signature)
+    return [
+        (band, int.from_bytes(
+            hashlib.blake2b(values[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes(), digest_size=8).digest(),
+            "little", signed=True
+        ))
+        for band in range(LSH_BANDS)
+    ]
+
+
+def estimated_similarity(signature: bytes, other: bytes) -> float:
+    if not signature or not other or len(signature) != len(other):
+        return 0.0
+    return float(np.mean(_values(signature) == _values(other)))
+
+
+def find_duplicates(connection: Connection, candidate_id: Optional[int], signature: bytes,
+                    threshold: float = DUPLICATE_THRESHOLD) -> List[Tuple[int, float]]:
+    """Candidates whose CVs are estimated to be at least `threshold` similar, most similar first"""
+    buckets = lsh_buckets(signature)
+    if not buckets:
+        return []
+
+    params = {"candidate_id": candidate_id if candidate_id is not None else -1}
+    conditions = []
+    for band, bucket in buckets:
+        conditions.append(f"(band = :band_{band} AND bucket = :bucket_{band})")
+        params[f"band_{band}"], params[f"bucket_{band}"] = band, bucket
+    rows = connection.execute(text(
+        "SELECT candidates.id, candidates.minhash FROM candidates WHERE candidates.id IN ("
+        f"SELECT candidate_id FROM candidate_lsh_buckets WHERE {' OR '.join(conditions)}"
+        ") AND candidates.id != :candidate_id"
+    ), params).all()
+
+    matches = [(row.id, estimated_similarity(signature, row.minhash)) for row in rows]
+    matches = [(other_id, similarity) for other_id, similarity in matches if similarity >= threshold]
+    return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+
+def find_duplicates_of(connection: Connection, candidates: Sequence[Tuple[int, bytes]],
+                       threshold: float = DUPLICATE_THRESHOLD) -> dict:
+    """find_duplicates for several (candidate_id, signature) pairs, keyed by candidate ID"""
+    return {
+        candidate_id: find_duplicates(connection, candidate_id, signature, threshold)
+        for candidate_id, signature in candidates
+    }
@@ -1,106 +1,405 @@
 """
 Email service for sending notifications and reminders
+
+Messages go out over a pool of authenticated SMTP sessions, so the
+connect/EHLO/STARTTLS/AUTH handshake is paid once per connection instead of
+once per message. A connection is retired after SMTP_MAX_MESSAGES_PER_CONNECTION
+messages or SMTP_IDLE_TIMEOUT seconds unused, and replaced (with one retry of
+the message) when the server drops it. send_many delivers a batch over the
+pool concurrently, throttled to SMTP_SEND_RATE messages per second.
+
+Templates live in EMAIL_TEMPLATE_DIR and are compiled once per process,
+with their bytecode cached on disk for the next one. Attachments are read
+and base64-encoded once and reused by every message that carries them,
+until the file changes.
 """
 
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from email.mime.base import MimeBase
-from email import encoders
+from email.mime.base import MIMEBase
+import base64
 import os
-from typing import List, Optional
-from jinja2 import Template
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", "60"))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+SMTP_SEND_RATE = float(os.getenv("SMTP_SEND_RATE", "10"))  # messages per second across the pool, 0 for no limit
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+EMAIL_TEMPLATE_DIR = os.getenv(
+    "EMAIL_TEMPLATE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "email")
+)
+EMAIL_TEMPLATE_CACHE_DIR = os.getenv("EMAIL_TEMPLATE_CACHE_DIR", "")  # empty for a per-user temp directory
+EMAIL_ATTACHMENT_CACHE_BYTES = int(os.getenv("EMAIL_ATTACHMENT_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+
+def is_connection_error(error: Exception) -> bool:
+    """True when the session is unusable; refused recipients or content leave it open"""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421  # service closing the channel
+    # SMTPException subclasses OSError, so check socket-level errors last
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+class OutgoingEmail(NamedTuple):
+    to_emails: List[str]
+    subject: str
+    html_content: str
+    text_content: Optional[str] = None
+    attachments: Optional[List[str]] = None
+
+
+class TemplateRegistry:
+    """Email templates loaded from a directory, each parsed and compiled once.
+
+    Compiled templates stay in memory (auto_reload is off, so the files are
+    not re-checked on every render) and their bytecode is cached on disk.
+    HTML templates are autoescaped, since names and positions come from CVs.
+    """
+    
+    def __init__(self, directory: str = EMAIL_TEMPLATE_DIR, cache_directory: str = EMAIL_TEMPLATE_CACHE_DIR):
+        if cache_directory:
+            os.makedirs(cache_directory, exist_ok=True)
+        self.environment = Environment(
+            loader=FileSystemLoader(directory),
+            bytecode_cache=FileSystemBytecodeCache(cache_directory or None),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False
+        )
+    
+    def get(self, name: str) -> Template:
+        return self.environment.get_template(name)
+    
+    def render(self, name: str, **context: Any) -> str:
+        return self.get(name).render(context)
+    
+    def render_many(self, name: str, rows: Iterable[Mapping[str, Any]]) -> List[str]:
+        """Mail-merge: render one template once per row of context"""
+        template = self.get(name)
+        return [template.render(row) for row in rows]
+
+
+class AttachmentCache:
+    """Base64-encoded attachment payloads keyed by path, bounded by their total encoded size.
+
+    An entry is reused while the file's mtime and size are unchanged, so an
+    edited brochure is picked up on the next message. Least recently used
+    payloads are evicted past max_bytes; a file larger than max_bytes is
+    encoded for each message and never cached.
+    """
+    
+    def __init__(self, max_bytes: int = EMAIL_ATTACHMENT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._data: "OrderedDict[str, Tuple[Tuple[int, int], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, file_path: str) -> Optional[str]:
+        """The file's encoded payload, or None if it does not exist"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._data.get(file_path)
+            if entry is not None and entry[0] == version:
+                self._data.move_to_end(file_path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        try:
+            with open(file_path, "rb") as attachment:
+                # Same line-wrapped form email.encoders.encode_base64 produces
+                payload = base64.encodebytes(attachment.read()).decode("ascii")
+        except OSError:
+            return None
+        if len(payload) <= self.max_bytes:
+            self._put(file_path, version, payload)
+        return payload
+    
+    def _put(self, file_path: str, version: Tuple[int, int], payload: str):
+        with self._lock:
+            previous = self._data.pop(file_path, None)
+            if previous is not None:
+                self.size_bytes -= len(previous[1])
+            self._data[file_path] = (version, payload)
+            self.size_bytes += len(payload)
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.size_bytes -= len(evicted)
+                self.evictions += 1
+    
+    def preload(self, file_paths: Iterable[str]):
+        """Encode each distinct file once up front, so a batch's concurrent senders all hit the cache"""
+        for file_path in dict.fromkeys(file_paths):
+            self.get(file_path)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size_bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads; a rate of 0 disables it"""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """Up to `size` authenticated SMTP sessions, shared between threads"""
+    
+    def __init__(self, host: str, port: int, username: str = "", password: str = "",
+                 use_tls: bool = SMTP_USE_TLS, size: int = SMTP_POOL_SIZE,
+                 max_messages: int = SMTP_MAX_MESSAGES_PER_CONNECTION,
+                 idle_timeout: float = SMTP_IDLE_TIMEOUT, timeout: float = SMTP_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connections_opened = 0
+        self.messages_sent = 0
+    
+    def _connect(self) -> _PooledConnection:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            self._close(smtp)
+            raise
+        self.connections_opened += 1
+        return _PooledConnection(smtp)
+    
+    @staticmethod
+    def _close(smtp: smtplib.SMTP):
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+    
+    def _checkout(self, fresh: bool = False) -> _PooledConnection:
+        while not fresh:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if time.monotonic() - connection.last_used < self.idle_timeout:
+                return connection
+            # Servers drop idle sessions; do not spend a failed send finding out
+            self._close(connection.smtp)
+        return self._connect()
+    
+    @contextmanager
+    def connection(self, fresh: bool = False):
+        """Borrow a session (a new one if fresh); it goes back to the pool unless it broke or reached max_messages"""
+        self._slots.acquire()
+        connection = None
+        healthy = True
+        try:
+            connection = self._checkout(fresh)
+            yield connection
+        except Exception as e:
+            healthy = not is_connection_error(e)
+            raise
+        finally:
+            if connection is not None:
+                connection.last_used = time.monotonic()
+                if healthy and connection.sent < self.max_messages:
+                    self._idle.put(connection)
+                else:
+                    self._close(connection.smtp)
+            self._slots.release()
+    
+    def send(self, message) -> None:
+        """Send a message, retrying once on a new connection if the pooled session has gone away"""
+        for attempt in range(2):
+            try:
+                with self.connection(fresh=attempt > 0) as connection:
+                    connection.smtp.send_message(message)
+                    connection.sent += 1
+                    self.messages_sent += 1
+                return
+            except Exception as e:
+                if attempt or not is_connection_error(e):
+                    raise
+    
+    def close(self):
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(connection.smtp)
+
 
 class EmailService:
-    def __init__(self):
-        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        self.email = os.getenv("EMAIL_USER", "")
-        self.password = os.getenv("EMAIL_PASSWORD", "")
+    def __init__(self, smtp_server: Optional[str] = None, smtp_port: Optional[int] = None,
+                 email: Optional[str] = None, password: Optional[str] = None,
+                 use_tls: bool = SMTP_USE_TLS, pool_size: int = SMTP_POOL_SIZE,
+                 max_messages_per_connection: int = SMTP_MAX_MESSAGES_PER_CONNECTION,
+                 send_rate: float = SMTP_SEND_RATE, templates: Optional[TemplateRegistry] = None,
+                 attachments: Optional[AttachmentCache] = None):
+        self.smtp_server = smtp_server or os.getenv("SMTP_SERVER", "smtp.gmail.com")
+        self.smtp_port = smtp_port or int(os.getenv("SMTP_PORT", "587"))
+        self.email = email if email is not None else os.getenv("EMAIL_USER", "")
+        self.password = password if password is not None else os.getenv("EMAIL_PASSWORD", "")
+        self.pool = SMTPConnectionPool(
+            self.smtp_server, self.smtp_port, self.email, self.password,
+            use_tls=use_tls, size=pool_size, max_messages=max_messages_per_connection
+        )
+        self.rate_limiter = RateLimiter(send_rate)
+        self.templates = templates or TemplateRegistry()
+        self.attachments = attachments or AttachmentCache()
+    
+    def build_message(self, to_emails: List[str], subject: str,
+                      html_content: str, text_content: str = None,
+                      attachments: List[str] = None) -> MIMEMultipart:
+        msg = MIMEMultipart('alternative')
+        msg['From'] = self.email
+        msg['To'] = ', '.join(to_emails)
+        msg['Subject'] = subject
+        
+        # Add text content
+        if text_content:
+            msg.attach(MIMEText(text_content, 'plain'))
+        
+        # Add HTML content
+        msg.attach(MIMEText(html_content, 'html'))
+        
+        # Add attachments, already encoded
+        if attachments:
+            for file_path in attachments:
+                payload = self.attachments.get(file_path)
+                if payload is not None:
+                    part = MIMEBase('application', 'octet-stream')
+                    part.set_payload(payload)
+                    part['Content-Transfer-Encoding'] = 'base64'
+                    part.add_header(
+                        'Content-Disposition',
+                        f'attachment; filename= {os.path.basename(file_path)}'
+                    )
+                    msg.attach(part)
+        
+        return msg
+    
+    def deliver(self, email: OutgoingEmail) -> None:
+        """Send one message, raising on failure"""
+        msg = self.build_message(*email)
+        self.rate_limiter.wait()
+        self.pool.send(msg)
     
     def send_email(self, to_emails: List[str], subject: str, 
                    html_content: str, text_content: str = None,
                    attachments: List[str] = None) -> bool:
         """Send email with optional attachments"""
         try:
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.email
-            msg['To'] = ', '.join(to_emails)
-            msg['Subject'] = subject
-            
-            # Add text content
-            if text_content:
-                msg.attach(MIMEText(text_content, 'plain'))
-            
-            # Add HTML content
-            msg.attach(MIMEText(html_content, 'html'))
-            
-            # Add attachments
-            if attachments:
-                for file_path in attachments:
-                    if os.path.exists(file_path):
-                        with open(file_path, "rb") as attachment:
-                            part = MimeBase('application', 'octet-stream')
-                            part.set_payload(attachment.read())
-                            encoders.encode_base64(part)
-                            part.add_header(
-                                'Content-Disposition',
-                                f'attachment; filename= {os.path.basename(file_path)}'
-                            )
-                            msg.attach(part)
-            
-            # Send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email, self.password)
-            server.send_message(msg)
-            server.quit()
-            
+            self.deliver(OutgoingEmail(to_emails, subject, html_content, text_content, attachments))
             return True
             
         except Exception as e:
             print(f"Error sending email: {e}")
             return False
     
+    def deliver_many(self, emails: List[OutgoingEmail]) -> List[Optional[str]]:
+        """Send a batch concurrently over the connection pool; returns None or the error for each message, in order"""
+        def attempt(email: OutgoingEmail) -> Optional[str]:
+            try:
+                self.deliver(email)
+                return None
+            except Exception as e:
+                return str(e) or type(e).__name__
+        
+        if not emails:
+            return []
+        self.attachments.preload(path for email in emails for path in email.attachments or ())
+        with ThreadPoolExecutor(max_workers=min(self.pool.size, len(emails))) as executor:
+            return list(executor.map(attempt, emails))
+    
+    def send_many(self, emails: List[OutgoingEmail]) -> List[bool]:
+        """Send a batch concurrently over the connection pool; returns each message's success, in order"""
+        results = []
+        for error in self.deliver_many(emails):
+            if error is not None:
+                print(f"Error sending email: {error}")
+            results.append(error is None)
+        return results
+    
+    def close(self):
+        """Quit the pooled SMTP sessions"""
+        self.pool.close()
+    
     def send_interview_invitation(self, candidate_email: str, candidate_name: str,
                                 position: str, interview_date: str, interview_time: str,
                                 interview_type: str, meeting_link: str = None) -> bool:
         """Send interview invitation email"""
-        
-        template = Template("""
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #2c3e50;">Interview Invitation</h2>
-                
-                <p>Dear {{ candidate_name }},</p>
-                
-                <p>We are pleased to invite you for an interview for the position of <strong>{{ position }}</strong>.</p>
-                
-                <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <h3 style="margin-top: 0; color: #495057;">Interview Details:</h3>
-                    <ul style="list-style: none; padding: 0;">
-                        <li><strong>Date:</strong> {{ interview_date }}</li>
-                        <li><strong>Time:</strong> {{ interview_time }}</li>
-                        <li><strong>Type:</strong> {{ interview_type }}</li>
-                        {% if meeting_link %}
-                        <li><strong>Meeting Link:</strong> <a href="{{ meeting_link }}">{{ meeting_link }}</a></li>
-                        {% endif %}
-                    </ul>
-                </div>
-                
-                <p>Please confirm your attendance by replying to this email.</p>
-                
-                <p>We look forward to speaking with you!</p>
-                
-                <p>Best regards,<br>
-                The Recruitment Team</p>
-            </div>
-        </body>
-        </html>
-        """)
-        
-        html_content = template.render(
+        return self.send_email(*self.interview_invitation_email(
+            candidate_email, candidate_name, position, interview_date, interview_time, interview_type, meeting_link
+        ))
+    
+    def interview_invitation_email(self, candidate_email: str, candidate_name: str,
+                                   position: str, interview_date: str, interview_time: str,
+                                   interview_type: str, meeting_link: str = None) -> OutgoingEmail:
+        """Render the interview invitation without sending it"""
+        html_content = self.templates.render(
+            "interview_invitation.html",
             candidate_name=candidate_name,
             position=position,
             interview_date=interview_date,
@@ -111,11 +410,16 @@ class EmailService:
         
         subject = f"Interview Invitation - {position}"
         
-        return self.send_email([candidate_email], subject, html_content)
+        return OutgoingEmail([candidate_email], subject, html_content)
     
     def send_status_update(self, candidate_email: str, candidate_name: str,
                           position: str, status: str, message: str = None) -> bool:
         """Send candidate status update email"""
+        return self.send_email(*self.status_update_email(candidate_email, candidate_name, position, status, message))
+    
+    def status_update_email(self, candidate_email: str, candidate_name: str,
+                            position: str, status: str, message: str = None) -> OutgoingEmail:
+        """Render the status update without sending it"""
         
         status_messages = {
             "shortlisted": "Congratulations! You have been shortlisted for the next round.",
@@ -126,31 +430,8 @@ class EmailService:
         default_message = status_messages.get(status, "Your application status has been updated.")
         final_message = message or default_message
         
-        template = Template("""
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #2c3e50;">Application Status Update</h2>
-                
-                <p>Dear {{ candidate_name }},</p>
-                
-                <p>We wanted to update you on the status of your application for the position of <strong>{{ position }}</strong>.</p>
-                
-                <div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <p><strong>Status:</strong> {{ status|title }}</p>
-                    <p>{{ message }}</p>
-                </div>
-                
-                <p>Thank you for your continued interest in our company.</p>
-                
-                <p>Best regards,<br>
-                The Recruitment Team</p>
-            </div>
-        </body>
-        </html>
-        """)
-        
-        html_content = template.render(
+        html_content = self.templates.render(
+            "status_update.html",
             candidate_name=candidate_name,
             position=position,
             status=status,
@@ -159,4 +440,4 @@ class EmailService:
         
         subject = f"Application Status Update - {position}"
         
-        return self.send_email([candidate_email], subject, html_content)
+        return OutgoingEmail([candidate_email], subject, html_content)
@@ -1,32 +1,56 @@
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import event, inspect, update, select, func, tuple_, union_all, or_, and_, bindparam, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session, relationship
+from sqlalchemy.orm import sessionmaker, Session, relationship, selectinload, defer, deferred
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from pydantic import BaseModel, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import sqlite3
 import json
+import base64
 import hashlib
 import jwt
 import os
 from pathlib import Path
 import uuid
+import mmap
 import asyncio
-from io import BytesIO
-import PyPDF2
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import docx
+import aiofiles
 import re
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import smtplib
+from skill_matcher import SkillMatcher
+from pdf_extraction import PDF_MAX_PAGES, PDF_PARALLEL_MIN_PAGES, PDF_TIME_BUDGET_SECONDS, PdfExtractionResult, count_pdf_pages, extract_page_range, extract_pdf_text, page_ranges
+from cache import LRUCache, TTLCache
+from bulk_scoring import score_candidates
+from migrations import run_migrations, applied_versions, explain_query_plan
+from dashboard_stats import GLOBAL_SCOPE, DashboardDeltas, rebuild_dashboard_stats
+from cv_search import search_candidates
+from semantic_matching import TfidfIndex
+from duplicate_detection import minhash_signature, lsh_buckets, find_duplicates, find_duplicates_of
+from email_service import EmailService
+from storage import DATABASE_URL, create_database_engine, create_async_database_engine
 
 # Database setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///./recruitment.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+SQLALCHEMY_DATABASE_URL = DATABASE_URL
+# Request handlers use the async engine; background workers, migrations and startup tasks the sync one
+engine = create_database_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_database_engine(SQLALCHEMY_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 # Security
@@ -34,12 +58,92 @@ security = HTTPBearer()
 SECRET_KEY = "your-secret-key-here"
 ALGORITHM = "HS256"
 
+# CV processing
+CV_CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".txt": "text/plain",
+}
+ZIP_CONTENT_TYPES = ["application/zip", "application/x-zip-compressed"]
+CV_POOL_WORKERS = int(os.getenv("CV_POOL_WORKERS", str(os.cpu_count() or 1)))
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "5000"))  # CVs per batch request, counting those unpacked from zips
+# Starlette's multipart parser rejects requests with more than 1000 files (Request.form max_files), so
+# individual uploads are capped there; bigger batches have to arrive as zip archives
+MAX_BATCH_DIRECT_FILES = min(MAX_BATCH_FILES, 1000)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", str(1024 * 1024 * 1024)))
+MAX_BATCH_UNPACKED_BYTES = int(os.getenv("MAX_BATCH_UNPACKED_BYTES", str(2 * 1024 * 1024 * 1024)))  # CVs extracted from zips
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_DIR = "uploads"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+INGESTION_POLL_INTERVAL = float(os.getenv("INGESTION_POLL_INTERVAL", "2.0"))
+# A job still 'processing' this long after it was claimed is assumed abandoned (its process died) and claimed again
+INGESTION_LEASE_SECONDS = float(os.getenv("INGESTION_LEASE_SECONDS", "600"))
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "2048"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "4096"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+# Bounds how long another process's job position change can go unseen in this process's listing cache
+JOB_POSITIONS_CACHE_TTL_SECONDS = float(os.getenv("JOB_POSITIONS_CACHE_TTL_SECONDS", "30"))
+MATCH_INDEX_PATH = os.getenv("MATCH_INDEX_PATH", "match_index.npz")
+MATCH_INDEX_SAVE_INTERVAL = float(os.getenv("MATCH_INDEX_SAVE_INTERVAL", "60"))
+# The drainer only starts by default once SMTP is configured, so dev and test runs never try to send mail
+EMAIL_OUTBOX_ENABLED = os.getenv("EMAIL_OUTBOX_ENABLED", "true" if os.getenv("EMAIL_USER") or os.getenv("SMTP_SERVER") else "false").lower() == "true"
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5.0"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "30"))
+OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "3600"))
+# A batch still 'sending' this long after it was claimed is assumed abandoned and claimed again
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "600"))
+MAX_INTERVIEW_MINUTES = int(os.getenv("MAX_INTERVIEW_MINUTES", "480"))
+
 app = FastAPI(
     title="AI Recruitment Platform API",
     description="Comprehensive API for AI-powered recruitment automation system",
     version="1.0.0"
 )
 
+class UploadSizeLimitMiddleware:
+    """Reject oversized upload bodies with 413 before they are read into the multipart parser"""
+    
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+    
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and int(content_length) > limit:
+            response = JSONResponse({"detail": f"Upload too large (max {limit} bytes)"}, status_code=413)
+            await response(scope, receive, send)
+            return
+        
+        # Chunked bodies have no Content-Length, so count bytes as they arrive
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=f"Upload too large (max {limit} bytes)")
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(UploadSizeLimitMiddleware, limits={
+    # Allow for multipart framing and form fields around the file itself
+    "/candidates/upload-cv": MAX_UPLOAD_BYTES + 64 * 1024,
+    "/candidates/upload-cv/batch": MAX_BATCH_UPLOAD_BYTES
+})
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -108,10 +212,42 @@ class Candidate(Base):
     education_score = Column(Float, default=0.0)
     status = Column(String, default="new")  # new, reviewed, shortlisted, rejected, interviewed
     uploaded_at = Column(DateTime, default=datetime.utcnow)
+    cv_text = deferred(Column(Text))  # extracted CV text, indexed by candidates_fts; not loaded by default
+    minhash = deferred(Column(LargeBinary))  # MinHash signature of cv_text for duplicate detection
     
     # Relationships
     job_position = relationship("JobPosition", back_populates="candidates")
     interviews = relationship("Interview", back_populates="candidate")
+    skills = relationship("CandidateSkill", cascade="all, delete-orphan")
+    minhash_buckets = relationship("CandidateLSHBucket", cascade="all, delete-orphan")
+    
+    # Also created on existing databases by migration 1
+    __table_args__ = (
+        Index("ix_candidates_job_status_score", "job_position_id", "status", overall_score.desc(), id.desc()),
+        Index("ix_candidates_score", overall_score.desc(), id.desc()),
+        Index("ix_candidates_uploaded_at", "uploaded_at"),
+    )
+
+class CandidateSkill(Base):
+    __tablename__ = "candidate_skills"
+    
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), primary_key=True)
+    skill = Column(String, primary_key=True)  # normalized (lower-case) skill name
+    
+    __table_args__ = (
+        Index("ix_candidate_skills_skill", "skill", "candidate_id"),
+    )
+
+class CandidateLSHBucket(Base):
+    __tablename__ = "candidate_lsh_buckets"
+    
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), primary_key=True)
+    band = Column(Integer, primary_key=True, autoincrement=False)
+    bucket = Column(Integer, nullable=False)  # 64-bit hash of the band's MinHash values
+    
+    __table_args__ = (
+        Index("ix_candidate_lsh_buckets_bucket", "band", "bucket"),
+    )
 
 class Interview(Base):
     __tablename__ = "interviews"
@@ -130,6 +266,13 @@ class Interview(Base):
     # Relationships
     candidate = relationship("Candidate", back_populates="interviews")
     interviewer = relationship("User")
+    
+    # Also created on existing databases by migrations 1 and 6
+    __table_args__ = (
+        Index("ix_interviews_interviewer_date", "interviewer_id", "scheduled_date"),
+        Index("ix_interviews_candidate_date", "candidate_id", "scheduled_date"),
+        Index("ix_interviews_status", "status"),
+    )
 
 class SystemMetric(Base):
     __tablename__ = "system_metrics"
@@ -152,8 +295,74 @@ class AuditLog(Base):
     details = Column(Text)
     timestamp = Column(DateTime, default=datetime.utcnow)
 
-# Create tables
+class IngestionJob(Base):
+    __tablename__ = "ingestion_jobs"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_position_id = Column(Integer, ForeignKey("job_positions.id"))
+    filename = Column(String, nullable=False)
+    content_type = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)
+    content_hash = Column(String)  # SHA-256 of the uploaded bytes
+    cache_hit = Column(Boolean, default=False)
+    status = Column(String, default="queued", index=True)  # queued, processing, completed, failed
+    candidate_id = Column(Integer, ForeignKey("candidates.id"))
+    error = Column(Text)
+    stage_timings = Column(Text)  # JSON string
+    duplicate_candidate_ids = Column(Text)  # JSON list of likely duplicates of the created candidate
+    attempts = Column(Integer, default=0)
+    created_by = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+class CVParseCache(Base):
+    __tablename__ = "cv_parse_cache"
+    
+    content_hash = Column(String, primary_key=True)  # SHA-256 of the uploaded bytes
+    parser_version = Column(String, nullable=False)
+    parsed_data = Column(Text, nullable=False)  # JSON string
+    cv_text = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class DashboardStats(Base):
+    __tablename__ = "dashboard_stats"
+    
+    job_position_id = Column(Integer, primary_key=True, autoincrement=False)  # 0 holds the totals across all positions
+    total_candidates = Column(Integer, nullable=False, default=0, server_default="0")
+    score_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    new_candidates = Column(Integer, nullable=False, default=0, server_default="0")
+    reviewed_candidates = Column(Integer, nullable=False, default=0, server_default="0")
+    shortlisted_candidates = Column(Integer, nullable=False, default=0, server_default="0")
+    rejected_candidates = Column(Integer, nullable=False, default=0, server_default="0")
+    interviewed_candidates = Column(Integer, nullable=False, default=0, server_default="0")
+    total_interviews = Column(Integer, nullable=False, default=0, server_default="0")
+    scheduled_interviews = Column(Integer, nullable=False, default=0, server_default="0")
+    active_jobs = Column(Integer, nullable=False, default=0, server_default="0")  # global row only
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # interview_invitation, status_update
+    recipient = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON template arguments, rendered at send time
+    status = Column(String, default="pending")  # pending, sending, sent, failed
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    claim_token = Column(String)  # drainer batch currently sending the message
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime)
+    
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+# Create tables, then bring existing databases up to the current schema
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 # Pydantic models
 class UserCreate(BaseModel):
@@ -204,6 +413,51 @@ class CandidateResponse(BaseModel):
     uploaded_at: datetime
     parsed_data: Dict[str, Any]
 
+class CandidatePage(BaseModel):
+    items: List[CandidateResponse]
+    next_cursor: Optional[str]
+
+class CandidateSearchResult(BaseModel):
+    id: int
+    name: str
+    email: str
+    job_position_id: Optional[int]
+    overall_score: float
+    status: str
+    uploaded_at: datetime
+    rank: float
+    snippet: str
+
+class CandidateSearchPage(BaseModel):
+    items: List[CandidateSearchResult]
+    next_cursor: Optional[str] = None
+
+class DuplicateCandidate(BaseModel):
+    id: int
+    name: str
+    email: str
+    job_position_id: Optional[int]
+    status: str
+    uploaded_at: datetime
+    similarity: float
+
+class CandidateDuplicates(BaseModel):
+    candidate_id: int
+    items: List[DuplicateCandidate]
+
+class CandidateMatch(BaseModel):
+    id: int
+    name: str
+    email: str
+    job_position_id: Optional[int]
+    overall_score: float
+    status: str
+    similarity: float
+
+class JobMatches(BaseModel):
+    job_position_id: int
+    items: List[CandidateMatch]
+
 class InterviewCreate(BaseModel):
     candidate_id: int
     interviewer_id: int
@@ -225,6 +479,25 @@ class InterviewResponse(BaseModel):
     status: str
     created_at: datetime
 
+class InterviewPage(BaseModel):
+    items: List[InterviewResponse]
+    next_cursor: Optional[str]
+
+class IngestionJobResponse(BaseModel):
+    id: str
+    job_position_id: int
+    filename: str
+    status: str
+    candidate_id: Optional[int]
+    cache_hit: bool
+    error: Optional[str]
+    stage_timings: Dict[str, float]
+    possible_duplicates: List[int]
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
@@ -235,12 +508,151 @@ class TokenResponse(BaseModel):
     user: UserResponse
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+# Job position listing cache, keyed by version so any change to a position or its
+# requirements made by this process makes every cached listing unreachable; the version
+# is per process, so entries also expire to pick up changes made by other workers
+job_positions_cache = TTLCache(maxsize=256, ttl=JOB_POSITIONS_CACHE_TTL_SECONDS)
+job_positions_cache_version = 0
+
+def invalidate_job_positions_cache():
+    global job_positions_cache_version
+    job_positions_cache_version += 1
+    job_positions_cache.clear()
+
+@event.listens_for(Session, "after_flush")
+def track_cached_model_changes(session, flush_context):
+    changed = session.new | session.dirty | session.deleted
+    if any(isinstance(obj, (JobPosition, JobRequirement)) for obj in changed):
+        session.info["job_positions_changed"] = True
+    
+    # Cached principals are keyed by email, so drop the old address too when it changes
+    changed_emails = session.info.setdefault("changed_user_emails", set())
+    for obj in session.dirty | session.deleted:
+        if isinstance(obj, User) and (obj in session.deleted or any(
+            inspect(obj).attrs[name].history.has_changes() for name in PRINCIPAL_FIELDS
+        )):
+            changed_emails.update({previous_value(obj, "email"), obj.email})
+    
+    # cv_text is deferred: read it from the instance state so an unset value is never lazy-loaded
+    new_cv_texts = session.info.setdefault("new_cv_texts", [])
+    for obj in session.new:
+        if isinstance(obj, Candidate) and inspect(obj).dict.get("cv_text"):
+            new_cv_texts.append((obj.id, obj.cv_text))
+
+def previous_value(obj, attribute: str):
+    """Value of an attribute as last loaded from the database"""
+    history = inspect(obj).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, attribute)
+
+def interview_job_position_id(session, candidate_id: Optional[int]) -> Optional[int]:
+    if candidate_id is None:
+        return None
+    # Straight through the connection: querying via the session would re-enter the flush
+    return session.connection().execute(
+        select(Candidate.job_position_id).where(Candidate.id == candidate_id)
+    ).scalar()
+
+@event.listens_for(Session, "after_flush")
+def maintain_dashboard_stats(session, flush_context):
+    """Apply candidate, interview and job position changes to dashboard_stats in the same transaction"""
+    deltas = DashboardDeltas()
+    
+    for obj in session.new:
+        if isinstance(obj, Candidate):
+            deltas.add_candidate(obj.job_position_id, obj.status, obj.overall_score)
+        elif isinstance(obj, Interview):
+            deltas.add_interview(interview_job_position_id(session, obj.candidate_id), obj.status)
+        elif isinstance(obj, JobPosition):
+            deltas.add_job_position(obj.status)
+    
+    for obj in session.dirty:
+        if isinstance(obj, Candidate):
+            before = tuple(previous_value(obj, name) for name in ("job_position_id", "status", "overall_score"))
+            after = (obj.job_position_id, obj.status, obj.overall_score)
+            if before != after:
+                deltas.add_candidate(*before, sign=-1)
+                deltas.add_candidate(*after)
+        elif isinstance(obj, Interview):
+            before = (previous_value(obj, "candidate_id"), previous_value(obj, "status"))
+            if before != (obj.candidate_id, obj.status):
+                deltas.add_interview(interview_job_position_id(session, before[0]), before[1], sign=-1)
+                deltas.add_interview(interview_job_position_id(session, obj.candidate_id), obj.status)
+        elif isinstance(obj, JobPosition):
+            before = previous_value(obj, "status")
+            if before != obj.status:
+                deltas.add_job_position(before, sign=-1)
+                deltas.add_job_position(obj.status)
+    
+    for obj in session.deleted:
+        if isinstance(obj, Candidate):
+            deltas.add_candidate(*(previous_value(obj, name) for name in ("job_position_id", "status", "overall_score")), sign=-1)
+        elif isinstance(obj, Interview):
+            deltas.add_interview(interview_job_position_id(session, previous_value(obj, "candidate_id")),
+                                 previous_value(obj, "status"), sign=-1)
+        elif isinstance(obj, JobPosition):
+            deltas.add_job_position(previous_value(obj, "status"), sign=-1)
+    
+    deltas.apply(session.connection())
+
+@event.listens_for(Session, "after_commit")
+def invalidate_caches_after_commit(session):
+    # Only after commit, so a concurrent reader cannot cache uncommitted state under the new version
+    if session.info.pop("job_positions_changed", False):
+        invalidate_job_positions_cache()
+    for email in session.info.pop("changed_user_emails", ()):
+        invalidate_principal(email)
+    match_index.queue(session.info.pop("new_cv_texts", ()))
+
+@event.listens_for(Session, "after_rollback")
+def discard_cache_changes_after_rollback(session):
+    session.info.pop("job_positions_changed", None)
+    session.info.pop("changed_user_emails", None)
+    session.info.pop("new_cv_texts", None)
+
+def job_position_response(job: JobPosition) -> JobPositionResponse:
+    return JobPositionResponse(
+        id=job.id,
+        title=job.title,
+        department=job.department,
+        location=job.location,
+        description=job.description,
+        status=job.status,
+        created_at=job.created_at,
+        requirements=[
+            {
+                "skill": req.skill,
+                "weight": req.weight,
+                "mandatory": req.mandatory,
+                "category": req.category
+            }
+            for req in job.requirements
+        ]
+    )
+
+# Keyset pagination cursors: opaque base64 of the last row's sort key
+def encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+def decode_cursor(cursor: str, *types) -> list:
+    """Decode a cursor from encode_cursor, checking it holds exactly one value of each of `types`"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # bool is an int subclass, but never a valid cursor value
+    if not isinstance(values, list) or len(values) != len(types) or any(
+        isinstance(value, bool) or not isinstance(value, expected) for value, expected in zip(values, types)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
 
 # Authentication functions
 def hash_password(password: str) -> str:
@@ -255,7 +667,25 @@ def create_access_token(data: dict):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user's fields needed for authorization checks"""
+    id: int
+    name: str
+    email: str
+    role: str
+    status: str
+    permissions: Tuple[str, ...]
+
+PRINCIPAL_FIELDS = ("name", "email", "role", "status", "permissions")
+
+# Principals keyed by token subject; invalidated when a user's row changes, with the TTL as a backstop
+principal_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+
+def invalidate_principal(email: str):
+    principal_cache.pop(email)
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_db)) -> Principal:
     try:
         payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -264,32 +694,516 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    user = db.query(User).filter(User.email == email).first()
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+    
+    user = (await db.execute(select(User).where(User.email == email))).scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+    principal = Principal(
+        id=user.id,
+        name=user.name,
+        email=user.email,
+        role=user.role,
+        status=user.status,
+        permissions=tuple(json.loads(user.permissions) if user.permissions else [])
+    )
+    principal_cache.put(email, principal)
+    return principal
 
 # CV Parsing functions
-def extract_text_from_pdf(file_content: bytes) -> str:
+SKILL_KEYWORDS = [
+    "Python", "JavaScript", "React", "Node.js", "SQL", "MongoDB", "AWS", "Docker",
+    "Kubernetes", "Git", "HTML", "CSS", "TypeScript", "Vue.js", "Angular", "Django",
+    "Flask", "Express", "PostgreSQL", "MySQL", "Redis", "Elasticsearch", "GraphQL",
+    "REST API", "Microservices", "Machine Learning", "Data Science", "TensorFlow",
+    "PyTorch", "Pandas", "NumPy", "Scikit-learn", "Java", "C++", "C#", ".NET",
+    "Spring Boot", "Hibernate", "Maven", "Gradle", "Jenkins", "CI/CD", "Agile",
+    "Scrum", "Leadership", "Project Management", "Communication", "Problem Solving"
+]
+skill_matcher = SkillMatcher({skill: [skill] for skill in SKILL_KEYWORDS})
+
+def extract_text_from_pdf(file_path: str) -> PdfExtractionResult:
     try:
-        pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
+        # Runs inside a CV pool worker: the batch path parallelises across files and a single
+        # upload's long PDF is split across the pool by extract_pdf_in_cv_pool, so never nest a pool here
+        return extract_pdf_text(file_path, workers=1)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
 
-def extract_text_from_docx(file_content: bytes) -> str:
+def extract_text_from_docx(file_path: str) -> str:
     try:
-        doc = docx.Document(BytesIO(file_content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        doc = docx.Document(file_path)
+        return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading DOCX: {str(e)}")
 
+def extract_text_from_txt(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        # Decode straight from a memory map instead of an intermediate bytes copy
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, "utf-8")
+
+def extract_cv_text(file_path: str, content_type: str) -> tuple:
+    """Extract plain text from a stored CV based on its content type; returns (text, truncated)"""
+    if content_type == "application/pdf":
+        result = extract_text_from_pdf(file_path)
+        return result.text, result.truncated
+    elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+        return extract_text_from_docx(file_path), False
+    else:  # text/plain
+        return extract_text_from_txt(file_path), False
+
+def process_cv_file(filename: str, content_type: str, file_path: str) -> Dict[str, Any]:
+    """Extract and parse a single stored CV - runs inside the CV process pool"""
+    started = time.perf_counter()
+    try:
+        text, truncated = extract_cv_text(file_path, content_type)
+    except HTTPException as e:
+        return {"filename": filename, "error": e.detail}
+    except UnicodeDecodeError:
+        return {"filename": filename, "error": "Text file is not valid UTF-8"}
+    extract_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    outcome = process_cv_text(filename, text, truncated)
+    outcome["timings"] = {"extract_ms": extract_ms, **outcome["timings"]}
+    return outcome
+
+def process_cv_text(filename: str, text: str, truncated: bool) -> Dict[str, Any]:
+    """Parse already extracted CV text and sign it for duplicate detection - runs inside the CV process pool"""
+    started = time.perf_counter()
+    parsed_data = parse_cv_content(text)
+    parsed_data["text_truncated"] = truncated
+    parsed = time.perf_counter()
+    minhash = minhash_signature(text)
+    signed = time.perf_counter()
+
+    return {
+        "filename": filename,
+        "parsed_data": parsed_data,
+        "text": text,
+        "minhash": minhash,
+        "timings": {
+            "parse_ms": round((parsed - started) * 1000, 2),
+            "minhash_ms": round((signed - parsed) * 1000, 2)
+        }
+    }
+
+def new_upload_path(filename: str) -> str:
+    """Unique path for a stored CV (in production, use cloud storage)"""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    return f"{UPLOAD_DIR}/{uuid.uuid4()}_{os.path.basename(filename)}"
+
+def remove_upload(file_path: str):
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+async def save_upload_stream(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> tuple:
+    """Stream an upload to disk in chunks, hashing on the fly; returns (file_path, content_hash, size)"""
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File too large (max {max_bytes} bytes)")
+    
+    file_path = new_upload_path(file.filename)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(file_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"File too large (max {max_bytes} bytes)")
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        remove_upload(file_path)
+        raise
+    return file_path, digest.hexdigest(), size
+
+def unpack_cv_archive(archive_path: str, max_entries: int = MAX_BATCH_FILES,
+                      max_bytes: int = MAX_BATCH_UNPACKED_BYTES) -> tuple:
+    """Stream every supported CV in a zip archive to disk.
+
+    The member list is checked against max_entries and max_bytes (uncompressed)
+    before anything is written, so an oversized archive is rejected without
+    filling the disk; zipfile never reads a member past its declared size.
+    Returns (entries, rejected) where entries are (filename, content_type, file_path, content_hash).
+    """
+    entries = []
+    rejected = []
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            members = []
+            unpacked_bytes = 0
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or info.filename.startswith("__MACOSX/"):
+                    continue
+                content_type = CV_CONTENT_TYPES.get(Path(name).suffix.lower())
+                if not content_type:
+                    continue
+                if info.file_size > MAX_UPLOAD_BYTES:
+                    rejected.append({"filename": name, "status": "failed", "error": "File too large"})
+                    continue
+                members.append((info, name, content_type))
+                unpacked_bytes += info.file_size
+                if len(members) > max_entries:
+                    raise HTTPException(status_code=400, detail=f"Too many files in batch (max {MAX_BATCH_FILES})")
+                if unpacked_bytes > max_bytes:
+                    raise HTTPException(
+                        status_code=413, detail=f"Batch too large when unpacked (max {MAX_BATCH_UNPACKED_BYTES} bytes)"
+                    )
+            
+            for info, name, content_type in members:
+                file_path = new_upload_path(name)
+                digest = hashlib.sha256()
+                with archive.open(info) as source, open(file_path, "wb") as out:
+                    while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                        digest.update(chunk)
+                        out.write(chunk)
+                entries.append((name, content_type, file_path, digest.hexdigest()))
+    except zipfile.BadZipFile:
+        for _, _, file_path, _ in entries:
+            remove_upload(file_path)
+        raise HTTPException(status_code=400, detail="Invalid zip archive")
+    return entries, rejected
+
+_cv_process_pool: Optional[ProcessPoolExecutor] = None
+
+def get_cv_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the process pool used for CPU-heavy CV extraction and parsing"""
+    global _cv_process_pool
+    if _cv_process_pool is None:
+        _cv_process_pool = ProcessPoolExecutor(max_workers=CV_POOL_WORKERS)
+    return _cv_process_pool
+
+def discard_cv_process_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next get_cv_process_pool() starts a new one"""
+    global _cv_process_pool
+    # Only the first caller replaces it; others may already be using the new pool
+    if _cv_process_pool is pool:
+        _cv_process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+async def run_in_cv_pool(fn, *args):
+    """Run fn in the CV process pool; if a worker died and broke the pool, rebuild it and retry once"""
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = get_cv_process_pool()
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            if attempt:
+                raise
+            print("CV process pool is broken; starting a new one")
+            discard_cv_process_pool(pool)
+
+async def extract_pdf_in_cv_pool(file_path: str) -> PdfExtractionResult:
+    """Extract a stored PDF with its page ranges spread over the CV pool.
+
+    A single upload is one file, so page ranges rather than files are what keep
+    the pool busy on a long or scanned CV. Same page and time budget as
+    extract_pdf_text; ranges still running at the deadline are dropped.
+    """
+    deadline = time.time() + PDF_TIME_BUDGET_SECONDS if PDF_TIME_BUDGET_SECONDS else None
+    try:
+        pages_total = await run_in_cv_pool(count_pdf_pages, file_path)
+    except BrokenProcessPool:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
+    page_limit = min(pages_total, PDF_MAX_PAGES) if PDF_MAX_PAGES else pages_total
+    if CV_POOL_WORKERS < 2 or page_limit < PDF_PARALLEL_MIN_PAGES:
+        return await run_in_cv_pool(extract_text_from_pdf, file_path)
+
+    ranges = [
+        asyncio.ensure_future(run_in_cv_pool(extract_page_range, file_path, start, stop, deadline))
+        for start, stop in page_ranges(page_limit, CV_POOL_WORKERS)
+    ]
+    timeout = max(0.0, deadline - time.time()) if deadline is not None else None
+    done, pending = await asyncio.wait(ranges, timeout=timeout)
+    for task in pending:
+        task.cancel()
+
+    pages = []
+    for task in ranges:
+        if task in done and task.exception() is None:
+            pages.extend(task.result())
+    return PdfExtractionResult(
+        text="".join(pages),
+        pages_total=pages_total,
+        pages_extracted=len(pages),
+        truncated=len(pages) < pages_total
+    )
+
+async def process_cv_upload(filename: str, content_type: str, file_path: str) -> Dict[str, Any]:
+    """process_cv_file for a single upload; PDFs are extracted page-parallel across the CV pool.
+
+    The batch path is already file-parallel and keeps calling process_cv_file directly.
+    """
+    if content_type != "application/pdf":
+        return await run_in_cv_pool(process_cv_file, filename, content_type, file_path)
+    started = time.perf_counter()
+    try:
+        extraction = await extract_pdf_in_cv_pool(file_path)
+    except HTTPException as e:
+        return {"filename": filename, "error": e.detail}
+    extract_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    outcome = await run_in_cv_pool(process_cv_text, filename, extraction.text, extraction.truncated)
+    outcome["timings"] = {"extract_ms": extract_ms, **outcome["timings"]}
+    return outcome
+
+def normalize_skill(skill: str) -> str:
+    return skill.strip().lower()
+
+def candidate_skill_names(parsed_data: Dict[str, Any]) -> List[str]:
+    """Distinct normalized skills from parsed CV data (flat list or categorized dict)"""
+    skills = parsed_data.get("skills") or []
+    if isinstance(skills, dict):
+        skills = [skill for category in skills.values() for skill in category]
+    return sorted({normalize_skill(skill) for skill in skills if isinstance(skill, str) and skill.strip()})
+
+def build_candidate(parsed_data: Dict[str, Any], scores: Dict[str, float],
+                    job_position_id: int, file_path: str, cv_text: Optional[str] = None,
+                    minhash: Optional[bytes] = None) -> Candidate:
+    """Create a Candidate record (with its candidate_skills and LSH bucket rows) from parsed CV data and scores"""
+    if minhash is None and cv_text is not None:
+        minhash = minhash_signature(cv_text)
+    return Candidate(
+        name=parsed_data.get("name", "Unknown"),
+        email=parsed_data.get("email", ""),
+        phone=parsed_data.get("phone", ""),
+        job_position_id=job_position_id,
+        cv_file_path=file_path,
+        parsed_data=json.dumps(parsed_data),
+        overall_score=scores["overall_score"],
+        skills_score=scores["skills_score"],
+        experience_score=scores["experience_score"],
+        education_score=scores["education_score"],
+        cv_text=cv_text,
+        minhash=minhash,
+        skills=[CandidateSkill(skill=skill) for skill in candidate_skill_names(parsed_data)],
+        minhash_buckets=[CandidateLSHBucket(band=band, bucket=bucket) for band, bucket in lsh_buckets(minhash or b"")]
+    )
+
+def backfill_candidate_skills():
+    """Populate candidate_skills for candidates stored before the table existed"""
+    db = SessionLocal()
+    try:
+        has_skills = select(CandidateSkill.candidate_id).where(CandidateSkill.candidate_id == Candidate.id).exists()
+        rows = db.query(Candidate.id, Candidate.parsed_data).filter(~has_skills).all()
+        skill_rows = [
+            {"candidate_id": row.id, "skill": skill}
+            for row in rows
+            for skill in candidate_skill_names(json.loads(row.parsed_data) if row.parsed_data else {})
+        ]
+        if skill_rows:
+            db.execute(CandidateSkill.__table__.insert(), skill_rows)
+            db.commit()
+    except IntegrityError:
+        # Another worker process starting at the same time backfilled these candidates first
+        db.rollback()
+    finally:
+        db.close()
+
+# Candidates stored before CV text was kept get it re-extracted from their files in the background,
+# and candidates with text but no MinHash signature get one
+TEXT_BACKFILL_BATCH_SIZE = 100
+
+def extract_stored_cv_text(file_path: str) -> tuple:
+    """Extract the text of a stored CV and its MinHash signature - runs inside the CV process pool"""
+    content_type = CV_CONTENT_TYPES.get(Path(file_path).suffix.lower())
+    text = ""
+    if content_type and os.path.exists(file_path):
+        try:
+            text = extract_cv_text(file_path, content_type)[0]
+        except Exception as e:
+            print(f"Error extracting text from {file_path}: {e}")
+    return text, minhash_signature(text)
+
+def candidates_missing_text(limit: int) -> List[tuple]:
+    db = SessionLocal()
+    try:
+        return [tuple(row) for row in db.query(Candidate.id, Candidate.cv_file_path).filter(
+            Candidate.cv_text.is_(None)
+        ).order_by(Candidate.id).limit(limit).all()]
+    finally:
+        db.close()
+
+def candidates_missing_minhash(limit: int) -> List[tuple]:
+    db = SessionLocal()
+    try:
+        return [tuple(row) for row in db.query(Candidate.id, Candidate.cv_text).filter(
+            Candidate.cv_text.isnot(None), Candidate.minhash.is_(None)
+        ).order_by(Candidate.id).limit(limit).all()]
+    finally:
+        db.close()
+
+def save_candidate_texts(texts: List[Dict[str, Any]]):
+    """Bulk-update cv_text and/or minhash by candidate ID, adding the LSH bucket rows for new signatures"""
+    db = SessionLocal()
+    try:
+        db.execute(update(Candidate), texts)
+        bucket_rows = [
+            {"candidate_id": row["id"], "band": band, "bucket": bucket}
+            for row in texts
+            for band, bucket in lsh_buckets(row.get("minhash") or b"")
+        ]
+        if bucket_rows:
+            db.execute(CandidateLSHBucket.__table__.insert(), bucket_rows)
+        db.commit()
+    finally:
+        db.close()
+    match_index.queue((row["id"], row["cv_text"]) for row in texts if "cv_text" in row)
+
+async def backfill_candidate_texts():
+    try:
+        while True:
+            rows = await asyncio.to_thread(candidates_missing_minhash, TEXT_BACKFILL_BATCH_SIZE)
+            if not rows:
+                break
+            signatures = await asyncio.gather(*[
+                run_in_cv_pool(minhash_signature, cv_text) for _, cv_text in rows
+            ])
+            await asyncio.to_thread(save_candidate_texts, [
+                {"id": candidate_id, "minhash": minhash} for (candidate_id, _), minhash in zip(rows, signatures)
+            ])
+        
+        while True:
+            rows = await asyncio.to_thread(candidates_missing_text, TEXT_BACKFILL_BATCH_SIZE)
+            if not rows:
+                return
+            # Unreadable or missing files store "" so they are not retried on every start
+            extracted = await asyncio.gather(*[
+                run_in_cv_pool(extract_stored_cv_text, file_path or "")
+                for _, file_path in rows
+            ])
+            await asyncio.to_thread(save_candidate_texts, [
+                {"id": candidate_id, "cv_text": cv_text, "minhash": minhash}
+                for (candidate_id, _), (cv_text, minhash) in zip(rows, extracted)
+            ])
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"Error backfilling CV text: {e}")
+
+# TF-IDF vectors of every CV with text, for matching candidates to job descriptions.
+# Commits queue new CVs; the index is saved to MATCH_INDEX_PATH every MATCH_INDEX_SAVE_INTERVAL seconds.
+MATCH_INDEX_CATCHUP_BATCH_SIZE = 1000
+match_index = TfidfIndex()
+
+def candidate_texts(candidate_ids: List[int]) -> List[tuple]:
+    db = SessionLocal()
+    try:
+        return [tuple(row) for row in db.query(Candidate.id, Candidate.cv_text).filter(
+            Candidate.id.in_(candidate_ids)
+        ).order_by(Candidate.id).all()]
+    finally:
+        db.close()
+
+def load_match_index():
+    """Load the saved index, then add CVs stored since it was written"""
+    match_index.load(MATCH_INDEX_PATH)
+    db = SessionLocal()
+    try:
+        stored = [row[0] for row in db.query(Candidate.id).filter(Candidate.cv_text.isnot(None)).order_by(Candidate.id)]
+    finally:
+        db.close()
+    missing = [candidate_id for candidate_id, indexed in zip(stored, match_index.contains(stored)) if not indexed]
+    for start in range(0, len(missing), MATCH_INDEX_CATCHUP_BATCH_SIZE):
+        match_index.queue(candidate_texts(missing[start:start + MATCH_INDEX_CATCHUP_BATCH_SIZE]))
+        match_index.flush_pending()
+
+def save_match_index():
+    match_index.flush_pending()
+    if match_index.dirty:
+        match_index.save(MATCH_INDEX_PATH)
+
+async def maintain_match_index():
+    try:
+        await asyncio.to_thread(load_match_index)
+        while True:
+            await asyncio.sleep(MATCH_INDEX_SAVE_INTERVAL)
+            await asyncio.to_thread(save_match_index)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"Error maintaining the match index: {e}")
+
+def job_match_text(job: JobPosition) -> str:
+    return " ".join([job.title or "", job.description or "", *(req.skill for req in job.requirements)])
+
+# Parse cache: SHA-256 of the uploaded bytes -> parse_cv_content output.
+# Bump PARSER_VERSION whenever extraction or parsing output changes so stale entries are ignored.
+# Version 2 also stores the extracted text.
+PARSER_VERSION = "2"
+parse_cache = LRUCache(maxsize=PARSE_CACHE_SIZE)
+parse_cache_db_hits = 0
+
+def get_cached_parses(db: Session, content_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Look up parsed CVs (parsed_data and extracted text) by content hash, in memory first and then in the database"""
+    global parse_cache_db_hits
+    found = {}
+    missing = []
+    for content_hash in set(content_hashes):
+        cached = parse_cache.get(content_hash)
+        if cached is not None:
+            found[content_hash] = {"parsed_data": json.loads(cached[0]), "text": cached[1]}
+        else:
+            missing.append(content_hash)
+    
+    if missing:
+        entries = db.query(CVParseCache).filter(
+            CVParseCache.content_hash.in_(missing),
+            CVParseCache.parser_version == PARSER_VERSION
+        ).all()
+        for entry in entries:
+            parse_cache.put(entry.content_hash, (entry.parsed_data, entry.cv_text))
+            found[entry.content_hash] = {"parsed_data": json.loads(entry.parsed_data), "text": entry.cv_text}
+        parse_cache_db_hits += len(entries)
+    
+    return found
+
+def upsert_parse_cache_statement(dialect_name: str, values: Dict[str, Any]):
+    """INSERT that overwrites an existing row for the same content hash instead of failing on it"""
+    updates = {column: value for column, value in values.items() if column != "content_hash"}
+    if dialect_name == "mysql":
+        return mysql.insert(CVParseCache).values(values).on_duplicate_key_update(**updates)
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    return insert(CVParseCache).values(values).on_conflict_do_update(index_elements=["content_hash"], set_=updates)
+
+def store_cached_parse(db: Session, content_hash: str, parsed_data: Dict[str, Any], text: Optional[str]):
+    """Add a parse result to the cache as part of the caller's transaction"""
+    serialized = json.dumps(parsed_data)
+    # A single upsert statement: concurrent uploads of the same file must not race a SELECT-then-INSERT
+    db.execute(upsert_parse_cache_statement(db.get_bind().dialect.name, {
+        "content_hash": content_hash,
+        "parser_version": PARSER_VERSION,
+        "parsed_data": serialized,
+        "cv_text": text,
+        "created_at": datetime.utcnow()
+    }))
+    parse_cache.put(content_hash, (serialized, text))
+
+def get_parse_cache_stats() -> Dict[str, Any]:
+    stats = parse_cache.stats()
+    # Memory misses that were found in the database are hits overall
+    lookups = stats["hits"] + stats["misses"]
+    total_hits = stats["hits"] + parse_cache_db_hits
+    return {
+        "parser_version": PARSER_VERSION,
+        "memory": stats,
+        "db_hits": parse_cache_db_hits,
+        "hits": total_hits,
+        "misses": lookups - total_hits,
+        "hit_rate": round(total_hits / lookups, 4) if lookups else 0.0
+    }
+
 def parse_cv_content(text: str) -> Dict[str, Any]:
     """Simple CV parsing logic - in production, use advanced NLP models"""
     parsed_data = {
@@ -314,22 +1228,8 @@ def parse_cv_content(text: str) -> Dict[str, Any]:
     if phones:
         parsed_data["phone"] = phones[0]
     
-    # Extract skills (simple keyword matching)
-    skill_keywords = [
-        "Python", "JavaScript", "React", "Node.js", "SQL", "MongoDB", "AWS", "Docker",
-        "Kubernetes", "Git", "HTML", "CSS", "TypeScript", "Vue.js", "Angular", "Django",
-        "Flask", "Express", "PostgreSQL", "MySQL", "Redis", "Elasticsearch", "GraphQL",
-        "REST API", "Microservices", "Machine Learning", "Data Science", "TensorFlow",
-        "PyTorch", "Pandas", "NumPy", "Scikit-learn", "Java", "C++", "C#", ".NET",
-        "Spring Boot", "Hibernate", "Maven", "Gradle", "Jenkins", "CI/CD", "Agile",
-        "Scrum", "Leadership", "Project Management", "Communication", "Problem Solving"
-    ]
-    
-    found_skills = []
-    text_upper = text.upper()
-    for skill in skill_keywords:
-        if skill.upper() in text_upper:
-            found_skills.append(skill)
+    # Extract skills (single pass over the text with the compiled skill automaton)
+    found_skills = skill_matcher.find_skills(text)
     
     parsed_data["skills"] = found_skills[:10]  # Limit to top 10 skills
     
@@ -418,17 +1318,301 @@ def calculate_candidate_score(candidate_data: Dict[str, Any], job_requirements:
     
     return scores
 
+# CV ingestion queue
+_ingestion_wakeup: Optional[asyncio.Event] = None
+_background_tasks: List[asyncio.Task] = []
+
+def claimable_ingestion_jobs():
+    """Queued jobs, and jobs whose lease ran out while processing (e.g. the server stopped mid-job)"""
+    lease_expired = datetime.utcnow() - timedelta(seconds=INGESTION_LEASE_SECONDS)
+    return or_(
+        IngestionJob.status == "queued",
+        and_(IngestionJob.status == "processing", IngestionJob.started_at < lease_expired)
+    )
+
+def claim_ingestion_job() -> Optional[Dict[str, Any]]:
+    """Atomically move the oldest claimable job to processing and return its details"""
+    db = SessionLocal()
+    try:
+        while True:
+            job = db.query(IngestionJob).filter(claimable_ingestion_jobs()).order_by(IngestionJob.created_at).first()
+            if job is None:
+                return None
+            
+            # Compare-and-set so concurrent workers never claim the same job
+            claimed = db.query(IngestionJob).filter(
+                IngestionJob.id == job.id, claimable_ingestion_jobs()
+            ).update({
+                "status": "processing",
+                "started_at": datetime.utcnow(),
+                "attempts": IngestionJob.attempts + 1
+            }, synchronize_session=False)
+            db.commit()
+            if claimed:
+                db.refresh(job)
+                return {
+                    "id": job.id,
+                    "job_position_id": job.job_position_id,
+                    "filename": job.filename,
+                    "content_type": job.content_type,
+                    "file_path": job.file_path,
+                    "content_hash": job.content_hash,
+                    "created_at": job.created_at,
+                    "started_at": job.started_at
+                }
+    finally:
+        db.close()
+
+def lookup_ingestion_cache(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return a ready parse outcome when the same file has been parsed before"""
+    if not job["content_hash"]:
+        return None
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        entry = get_cached_parses(db, [job["content_hash"]]).get(job["content_hash"])
+    finally:
+        db.close()
+    if entry is None:
+        return None
+    return {
+        "filename": job["filename"],
+        "parsed_data": entry["parsed_data"],
+        "text": entry["text"],
+        "minhash": minhash_signature(entry["text"]) if entry["text"] is not None else None,
+        "cache_hit": True,
+        "timings": {"cache_lookup_ms": round((time.perf_counter() - started) * 1000, 2)}
+    }
+
+def own_ingestion_job(db: Session, job: Dict[str, Any]) -> bool:
+    """Lock the job row for this transaction if it is still our claim (not reclaimed after its lease ran out)"""
+    return bool(db.query(IngestionJob).filter(
+        IngestionJob.id == job["id"], IngestionJob.status == "processing", IngestionJob.started_at == job["started_at"]
+    ).update({"finished_at": datetime.utcnow()}, synchronize_session=False))
+
+def complete_ingestion_job(job: Dict[str, Any], outcome: Dict[str, Any]) -> None:
+    """Score the parsed CV, create the candidate and finish the job in one transaction"""
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        if not own_ingestion_job(db, job):
+            print(f"Ingestion job {job['id']} was claimed again by another worker; discarding this result")
+            return
+        ingestion_job = db.query(IngestionJob).filter(IngestionJob.id == job["id"]).first()
+        timings = {"queued_ms": round((job["started_at"] - job["created_at"]).total_seconds() * 1000, 2)}
+        
+        if "error" in outcome:
+            ingestion_job.status = "failed"
+            ingestion_job.error = outcome["error"]
+        else:
+            job_requirements = db.query(JobRequirement).filter(JobRequirement.job_position_id == job["job_position_id"]).all()
+            scores = calculate_candidate_score(outcome["parsed_data"], job_requirements)
+            candidate = build_candidate(
+                outcome["parsed_data"], scores, job["job_position_id"], job["file_path"],
+                outcome.get("text"), outcome.get("minhash")
+            )
+            db.add(candidate)
+            if outcome.get("cache_hit"):
+                ingestion_job.cache_hit = True
+            elif job["content_hash"]:
+                store_cached_parse(db, job["content_hash"], outcome["parsed_data"], outcome.get("text"))
+            db.flush()
+            
+            duplicates = find_duplicates(db.connection(), candidate.id, candidate.minhash or b"")
+            ingestion_job.duplicate_candidate_ids = json.dumps([duplicate_id for duplicate_id, _ in duplicates])
+            ingestion_job.status = "completed"
+            ingestion_job.candidate_id = candidate.id
+            timings.update(outcome["timings"])
+        
+        timings["persist_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        ingestion_job.finished_at = datetime.utcnow()
+        timings["total_ms"] = round((ingestion_job.finished_at - job["created_at"]).total_seconds() * 1000, 2)
+        ingestion_job.stage_timings = json.dumps(timings)
+        db.commit()
+    finally:
+        db.close()
+
+def job_error_message(error: Exception) -> str:
+    """Error text safe to show on a job: database errors would otherwise include the SQL and its parameters"""
+    if isinstance(error, DBAPIError):
+        return f"Database error: {error.orig}"
+    return str(error)
+
+def fail_ingestion_job(job: Dict[str, Any], error: str) -> None:
+    db = SessionLocal()
+    try:
+        if own_ingestion_job(db, job):
+            db.query(IngestionJob).filter(IngestionJob.id == job["id"]).update(
+                {"status": "failed", "error": error}, synchronize_session=False
+            )
+        db.commit()
+    finally:
+        db.close()
+
+async def ingestion_worker():
+    """Drain the ingestion queue, keeping parsing and DB work off the event loop"""
+    while True:
+        try:
+            job = await asyncio.to_thread(claim_ingestion_job)
+            if job is None:
+                _ingestion_wakeup.clear()
+                try:
+                    await asyncio.wait_for(_ingestion_wakeup.wait(), timeout=INGESTION_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            try:
+                # Repeat uploads of the same file skip straight to scoring
+                outcome = await asyncio.to_thread(lookup_ingestion_cache, job)
+                if outcome is None:
+                    outcome = await process_cv_upload(job["filename"], job["content_type"], job["file_path"])
+                await asyncio.to_thread(complete_ingestion_job, job, outcome)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error processing ingestion job {job['id']}: {e}")
+                await asyncio.to_thread(fail_ingestion_job, job, job_error_message(e))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # e.g. "database is locked" under load; a job claimed before the error is picked up again when its lease runs out
+            print(f"Ingestion worker error: {e}")
+            await asyncio.sleep(INGESTION_POLL_INTERVAL)
+
+# Transactional email outbox: endpoints add EmailOutbox rows in the same transaction as the change
+# they announce, and the drainer sends them in batches so requests never wait on SMTP. The drainer
+# runs by default only when EMAIL_USER or SMTP_SERVER is set (EMAIL_OUTBOX_ENABLED overrides); until
+# then messages stay pending in the outbox rather than failing against an unconfigured server
+_outbox_wakeup: Optional[asyncio.Event] = None
+mailer = EmailService()
+
+# Statuses the candidate is told about; the others are internal review steps
+CANDIDATE_NOTIFY_STATUSES = {"shortlisted", "rejected", "interviewed"}
+
+OUTBOX_RENDERERS = {
+    "interview_invitation": mailer.interview_invitation_email,
+    "status_update": mailer.status_update_email,
+}
+
+def queue_email(db, kind: str, recipient: str, **payload):
+    """Add an outbox message to the caller's session; it is sent only if that transaction commits"""
+    db.add(EmailOutbox(kind=kind, recipient=recipient, payload=json.dumps(payload, default=str)))
+
+def wake_outbox_drainer():
+    if _outbox_wakeup is not None:
+        _outbox_wakeup.set()
+
+def outbox_retry_delay(attempts: int) -> float:
+    return min(OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), OUTBOX_RETRY_MAX_SECONDS)
+
+def claim_outbox_batch(limit: int) -> List[Dict[str, Any]]:
+    """Move up to `limit` due messages to sending and return them"""
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        # While a message is sending, next_attempt_at holds its lease expiry: once that passes, the
+        # drainer that claimed it is assumed dead (e.g. the server stopped mid-batch) and it is due again
+        due_condition = (EmailOutbox.status.in_(["pending", "sending"]), EmailOutbox.next_attempt_at <= now)
+        due = select(EmailOutbox.id).where(*due_condition).order_by(EmailOutbox.next_attempt_at, EmailOutbox.id).limit(limit)
+        
+        # Tag the batch so concurrent drainers never send the same message
+        token = str(uuid.uuid4())
+        db.query(EmailOutbox).filter(EmailOutbox.id.in_(due), *due_condition).update({
+            "status": "sending",
+            "claim_token": token,
+            "attempts": EmailOutbox.attempts + 1,
+            "next_attempt_at": now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+        }, synchronize_session=False)
+        db.commit()
+        
+        return [
+            {"id": row.id, "kind": row.kind, "recipient": row.recipient, "payload": row.payload, "attempts": row.attempts,
+             "claim_token": token}
+            for row in db.query(EmailOutbox).filter(EmailOutbox.claim_token == token).order_by(EmailOutbox.id)
+        ]
+    finally:
+        db.close()
+
+def deliver_outbox_batch(batch: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """Render and send a claimed batch; returns None or the error for each message"""
+    errors: List[Optional[str]] = [None] * len(batch)
+    rendered = []
+    for index, message in enumerate(batch):
+        try:
+            rendered.append((index, OUTBOX_RENDERERS[message["kind"]](**json.loads(message["payload"]))))
+        except Exception as e:
+            errors[index] = f"Could not render {message['kind']} email: {e}"
+    
+    for (index, _), error in zip(rendered, mailer.deliver_many([email for _, email in rendered])):
+        errors[index] = error
+    return errors
+
+def record_outbox_results(batch: List[Dict[str, Any]], errors: List[Optional[str]]):
+    """Mark sent messages, and schedule failed ones for a retry with exponential backoff"""
+    now = datetime.utcnow()
+    updates = []
+    for message, error in zip(batch, errors):
+        row = {"message_id": message["id"], "token": message["claim_token"], "last_error": error, "sent_at": None,
+               "next_attempt_at": now}
+        if error is None:
+            row.update(status="sent", sent_at=now)
+        elif message["attempts"] >= OUTBOX_MAX_ATTEMPTS:
+            row.update(status="failed")
+        else:
+            row.update(status="pending", next_attempt_at=now + timedelta(seconds=outbox_retry_delay(message["attempts"])))
+        updates.append(row)
+    
+    # Only rows still held by this batch: after a lease ran out another drainer owns them
+    outbox = EmailOutbox.__table__
+    statement = update(outbox).where(
+        outbox.c.id == bindparam("message_id"), outbox.c.claim_token == bindparam("token")
+    ).values(claim_token=None)
+    db = SessionLocal()
+    try:
+        db.execute(statement, updates)
+        db.commit()
+    finally:
+        db.close()
+
+async def outbox_drainer():
+    while True:
+        try:
+            batch = await asyncio.to_thread(claim_outbox_batch, OUTBOX_BATCH_SIZE)
+            if not batch:
+                _outbox_wakeup.clear()
+                try:
+                    await asyncio.wait_for(_outbox_wakeup.wait(), timeout=OUTBOX_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            try:
+                errors = await asyncio.to_thread(deliver_outbox_batch, batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error sending outbox batch: {e}")
+                errors = [str(e)] * len(batch)
+            await asyncio.to_thread(record_outbox_results, batch, errors)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # e.g. "database is locked"; a batch claimed before the error is retried when its lease runs out
+            print(f"Outbox drainer error: {e}")
+            await asyncio.sleep(OUTBOX_POLL_INTERVAL)
+
 # API Routes
 
 @app.post("/auth/login", response_model=TokenResponse)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == login_data.email).first()
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
+    user = (await db.execute(select(User).where(User.email == login_data.email))).scalar_one_or_none()
     if not user or not verify_password(login_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     access_token = create_access_token(data={"sub": user.email})
     
@@ -450,9 +1634,9 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     )
 
 @app.post("/auth/register", response_model=UserResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if user exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = (await db.execute(select(User).where(User.email == user_data.email))).scalar_one_or_none()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
@@ -467,8 +1651,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return UserResponse(
         id=new_user.id,
@@ -482,11 +1666,11 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
 @app.get("/users", response_model=List[UserResponse])
-async def get_users(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_users(current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    users = db.query(User).all()
+    users = (await db.execute(select(User))).scalars().all()
     return [
         UserResponse(
             id=user.id,
@@ -504,198 +1688,526 @@ async def get_users(current_user: User = Depends(get_current_user), db: Session
 @app.post("/job-positions", response_model=JobPositionResponse)
 async def create_job_position(
     job_data: JobPositionCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    # Create job position
+    # Create job position together with its requirements
     new_job = JobPosition(
         title=job_data.title,
         department=job_data.department,
         location=job_data.location,
         description=job_data.description,
-        created_by=current_user.id
+        created_by=current_user.id,
+        requirements=[
+            JobRequirement(
+                skill=req_data["skill"],
+                weight=req_data.get("weight", 50),
+                mandatory=req_data.get("mandatory", False),
+                category=req_data.get("category", "skill")
+            )
+            for req_data in job_data.requirements
+        ]
     )
     
     db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
-    
-    # Add requirements
-    for req_data in job_data.requirements:
-        requirement = JobRequirement(
-            job_position_id=new_job.id,
-            skill=req_data["skill"],
-            weight=req_data.get("weight", 50),
-            mandatory=req_data.get("mandatory", False),
-            category=req_data.get("category", "skill")
-        )
-        db.add(requirement)
-    
-    db.commit()
+    await db.flush()
+    response = job_position_response(new_job)
+    await db.commit()
     
-    # Return with requirements
-    requirements = db.query(JobRequirement).filter(JobRequirement.job_position_id == new_job.id).all()
-    
-    return JobPositionResponse(
-        id=new_job.id,
-        title=new_job.title,
-        department=new_job.department,
-        location=new_job.location,
-        description=new_job.description,
-        status=new_job.status,
-        created_at=new_job.created_at,
-        requirements=[
-            {
-                "skill": req.skill,
-                "weight": req.weight,
-                "mandatory": req.mandatory,
-                "category": req.category
-            }
-            for req in requirements
-        ]
-    )
+    return response
 
 @app.get("/job-positions", response_model=List[JobPositionResponse])
 async def get_job_positions(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    status: Optional[str] = Query(None),
+    department: Optional[str] = Query(None),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    jobs = db.query(JobPosition).all()
-    result = []
-    
-    for job in jobs:
-        requirements = db.query(JobRequirement).filter(JobRequirement.job_position_id == job.id).all()
-        result.append(JobPositionResponse(
-            id=job.id,
-            title=job.title,
-            department=job.department,
-            location=job.location,
-            description=job.description,
-            status=job.status,
-            created_at=job.created_at,
-            requirements=[
-                {
-                    "skill": req.skill,
-                    "weight": req.weight,
-                    "mandatory": req.mandatory,
-                    "category": req.category
-                }
-                for req in requirements
-            ]
-        ))
+    cache_key = (job_positions_cache_version, status, department)
+    cached = job_positions_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Requirements are loaded for all jobs in one extra query instead of one per job
+    query = select(JobPosition).options(selectinload(JobPosition.requirements))
+    
+    if status:
+        query = query.where(JobPosition.status == status)
+    
+    if department:
+        query = query.where(JobPosition.department == department)
+    
+    jobs = (await db.execute(query.order_by(JobPosition.id))).scalars().all()
+    result = [job_position_response(job) for job in jobs]
+    job_positions_cache.put(cache_key, result)
     
     return result
 
-@app.post("/candidates/upload-cv")
+@app.post("/job-positions/{job_position_id}/rescore")
+async def rescore_job_candidates(
+    job_position_id: int,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Recompute every candidate's scores for a job after its requirements changed"""
+    started = time.perf_counter()
+    job = await db.get(JobPosition, job_position_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job position not found")
+    
+    requirements = [
+        {"skill": req.skill, "weight": req.weight or 0, "category": req.category}
+        for req in (await db.execute(
+            select(JobRequirement).where(JobRequirement.job_position_id == job_position_id)
+        )).scalars()
+    ]
+    rows = (await db.execute(
+        select(Candidate.id, Candidate.parsed_data, Candidate.overall_score).where(
+            Candidate.job_position_id == job_position_id
+        )
+    )).all()
+    loaded = time.perf_counter()
+    
+    scores = score_candidates([json.loads(row.parsed_data) if row.parsed_data else {} for row in rows], requirements)
+    scored = time.perf_counter()
+    
+    # Single bulk UPDATE (executemany keyed on the primary key)
+    if rows:
+        await db.execute(update(Candidate), [
+            {
+                "id": row.id,
+                "overall_score": float(overall),
+                "skills_score": float(skills),
+                "experience_score": float(experience),
+                "education_score": float(education)
+            }
+            for row, overall, skills, experience, education in zip(
+                rows, scores["overall_score"], scores["skills_score"],
+                scores["experience_score"], scores["education_score"]
+            )
+        ])
+        # Bulk UPDATEs bypass the flush hook, so adjust the score sums here
+        deltas = DashboardDeltas()
+        deltas.add_score(job_position_id, float(scores["overall_score"].sum()) - sum(row.overall_score or 0.0 for row in rows))
+        await db.run_sync(lambda session: deltas.apply(session.connection()))
+    await db.commit()
+    finished = time.perf_counter()
+    
+    return {
+        "message": f"Rescored {len(rows)} candidates",
+        "job_position_id": job_position_id,
+        "rescored": len(rows),
+        "average_score": round(float(scores["overall_score"].mean()), 1) if rows else 0,
+        "timings": {
+            "load_ms": round((loaded - started) * 1000, 2),
+            "score_ms": round((scored - loaded) * 1000, 2),
+            "update_ms": round((finished - scored) * 1000, 2),
+            "total_ms": round((finished - started) * 1000, 2)
+        }
+    }
+
+@app.post("/candidates/upload-cv", status_code=202)
 async def upload_cv(
     file: UploadFile = File(...),
     job_position_id: int = Form(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     # Validate file type
-    allowed_types = ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "text/plain"]
+    allowed_types = list(CV_CONTENT_TYPES.values())
     if file.content_type not in allowed_types:
         raise HTTPException(status_code=400, detail="Invalid file type. Only PDF, DOCX, and TXT files are allowed.")
     
-    # Read file content
-    file_content = await file.read()
-    
-    # Extract text based on file type
-    if file.content_type == "application/pdf":
-        text = extract_text_from_pdf(file_content)
-    elif file.content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        text = extract_text_from_docx(file_content)
-    else:  # text/plain
-        text = file_content.decode('utf-8')
-    
-    # Parse CV content
-    parsed_data = parse_cv_content(text)
-    
-    # Get job requirements for scoring
-    job_requirements = db.query(JobRequirement).filter(JobRequirement.job_position_id == job_position_id).all()
+    # Stream the file to disk and queue it for background parsing and scoring
+    file_path, content_hash, _ = await save_upload_stream(file)
     
-    # Calculate scores
-    scores = calculate_candidate_score(parsed_data, job_requirements)
-    
-    # Save file (in production, use cloud storage)
-    file_path = f"uploads/{uuid.uuid4()}_{file.filename}"
-    os.makedirs("uploads", exist_ok=True)
-    with open(file_path, "wb") as f:
-        f.write(file_content)
-    
-    # Create candidate record
-    candidate = Candidate(
-        name=parsed_data.get("name", "Unknown"),
-        email=parsed_data.get("email", ""),
-        phone=parsed_data.get("phone", ""),
+    ingestion_job = IngestionJob(
         job_position_id=job_position_id,
-        cv_file_path=file_path,
-        parsed_data=json.dumps(parsed_data),
-        overall_score=scores["overall_score"],
-        skills_score=scores["skills_score"],
-        experience_score=scores["experience_score"],
-        education_score=scores["education_score"]
+        filename=file.filename,
+        content_type=file.content_type,
+        file_path=file_path,
+        content_hash=content_hash,
+        created_by=current_user.id
     )
+    db.add(ingestion_job)
+    await db.commit()
     
-    db.add(candidate)
-    db.commit()
-    db.refresh(candidate)
+    if _ingestion_wakeup is not None:
+        _ingestion_wakeup.set()
     
     return {
-        "message": "CV uploaded and processed successfully",
-        "candidate_id": candidate.id,
-        "parsed_data": parsed_data,
-        "scores": scores
+        "message": "CV uploaded and queued for processing",
+        "job_id": ingestion_job.id,
+        "status": ingestion_job.status
     }
 
-@app.get("/candidates", response_model=List[CandidateResponse])
+@app.post("/candidates/upload-cv/batch")
+async def upload_cv_batch(
+    files: List[UploadFile] = File(..., description=f"At most {MAX_BATCH_DIRECT_FILES} files per request; send larger batches as zip archives"),
+    job_position_id: int = Form(...),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Upload many CVs (or zip archives of CVs) for one job position in a single request.
+
+    Starlette parses at most MAX_BATCH_DIRECT_FILES (1000) files per request and rejects more before
+    this runs, so larger batches, up to MAX_BATCH_FILES CVs in total, must be sent as zip archives.
+    """
+    started = time.perf_counter()
+    results = []
+    entries = []  # (filename, content_type, file_path, content_hash)
+    unpacked_bytes = 0
+    
+    def discard_entries():
+        for _, _, file_path, _ in entries:
+            remove_upload(file_path)
+    
+    for file in files:
+        if len(entries) > MAX_BATCH_FILES:
+            discard_entries()
+            raise HTTPException(status_code=400, detail=f"Too many files in batch (max {MAX_BATCH_FILES})")
+        if file.content_type in ZIP_CONTENT_TYPES or file.filename.lower().endswith(".zip"):
+            try:
+                archive_path, _, _ = await save_upload_stream(file, MAX_BATCH_UPLOAD_BYTES)
+            except HTTPException:
+                discard_entries()
+                raise
+            try:
+                # The limits cover the whole batch, so each archive gets what earlier files left
+                archive_entries, rejected = await asyncio.to_thread(
+                    unpack_cv_archive, archive_path,
+                    MAX_BATCH_FILES - len(entries), MAX_BATCH_UNPACKED_BYTES - unpacked_bytes
+                )
+            except HTTPException:
+                discard_entries()
+                raise
+            finally:
+                remove_upload(archive_path)
+            entries.extend(archive_entries)
+            unpacked_bytes += sum(os.path.getsize(file_path) for _, _, file_path, _ in archive_entries)
+            results.extend(rejected)
+        elif file.content_type in CV_CONTENT_TYPES.values():
+            try:
+                file_path, content_hash, _ = await save_upload_stream(file)
+            except HTTPException as e:
+                results.append({"filename": file.filename, "status": "failed", "error": e.detail})
+                continue
+            entries.append((file.filename, file.content_type, file_path, content_hash))
+        else:
+            results.append({"filename": file.filename, "status": "failed", "error": "Invalid file type"})
+    
+    if len(entries) > MAX_BATCH_FILES:
+        discard_entries()
+        raise HTTPException(status_code=400, detail=f"Too many files in batch (max {MAX_BATCH_FILES})")
+    received = time.perf_counter()
+    
+    # Reuse cached parses and fan the remaining unique files out to the process pool
+    cached = await db.run_sync(get_cached_parses, [content_hash for _, _, _, content_hash in entries])
+    pending = {}
+    for filename, content_type, file_path, content_hash in entries:
+        if content_hash not in cached and content_hash not in pending:
+            pending[content_hash] = (filename, content_type, file_path)
+    
+    fresh = await asyncio.gather(*[
+        run_in_cv_pool(process_cv_file, filename, content_type, file_path)
+        for filename, content_type, file_path in pending.values()
+    ])
+    fresh = dict(zip(pending, fresh))
+    # Cached parses carry the text but not its MinHash signature
+    cached_minhashes = await asyncio.to_thread(lambda: {
+        content_hash: minhash_signature(entry["text"])
+        for content_hash, entry in cached.items() if entry["text"] is not None
+    })
+    parsed = time.perf_counter()
+    
+    # Score and persist every parsed CV in one transaction
+    job_requirements = (await db.execute(
+        select(JobRequirement).where(JobRequirement.job_position_id == job_position_id)
+    )).scalars().all()
+    saved = []
+    for filename, _, file_path, content_hash in entries:
+        if content_hash in cached:
+            outcome = dict(cached[content_hash], filename=filename, cache_hit=True, timings={},
+                           minhash=cached_minhashes.get(content_hash))
+        else:
+            outcome = dict(fresh[content_hash], filename=filename, cache_hit=False)
+        
+        if "error" in outcome:
+            remove_upload(file_path)
+            results.append({"filename": filename, "status": "failed", "error": outcome["error"]})
+            continue
+        
+        if not outcome["cache_hit"]:
+            await db.run_sync(store_cached_parse, content_hash, outcome["parsed_data"], outcome["text"])
+            cached[content_hash] = {"parsed_data": outcome["parsed_data"], "text": outcome["text"]}
+            cached_minhashes[content_hash] = outcome["minhash"]
+        scores = calculate_candidate_score(outcome["parsed_data"], job_requirements)
+        candidate = build_candidate(
+            outcome["parsed_data"], scores, job_position_id, file_path, outcome["text"], outcome["minhash"]
+        )
+        db.add(candidate)
+        saved.append((candidate, outcome, scores))
+    
+    await db.flush()
+    # Copies within this batch are already flushed, so they are reported too
+    duplicates = await db.run_sync(lambda session: find_duplicates_of(
+        session.connection(), [(candidate.id, candidate.minhash or b"") for candidate, _, _ in saved]
+    ))
+    for candidate, outcome, scores in saved:
+        results.append({
+            "filename": outcome["filename"],
+            "status": "processed",
+            "candidate_id": candidate.id,
+            "scores": scores,
+            "cache_hit": outcome["cache_hit"],
+            "possible_duplicates": [duplicate_id for duplicate_id, _ in duplicates[candidate.id]],
+            "timings": outcome["timings"]
+        })
+    await db.commit()
+    finished = time.perf_counter()
+    
+    return {
+        "message": f"Processed {len(saved)} of {len(results)} CVs",
+        "processed": len(saved),
+        "failed": len(results) - len(saved),
+        "results": results,
+        "timings": {
+            "receive_ms": round((received - started) * 1000, 2),
+            "parse_ms": round((parsed - received) * 1000, 2),
+            "persist_ms": round((finished - parsed) * 1000, 2),
+            "total_ms": round((finished - started) * 1000, 2)
+        }
+    }
+
+@app.get("/ingestion-jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(
+    job_id: str,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    job = await db.get(IngestionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    
+    return IngestionJobResponse(
+        id=job.id,
+        job_position_id=job.job_position_id,
+        filename=job.filename,
+        status=job.status,
+        candidate_id=job.candidate_id,
+        cache_hit=bool(job.cache_hit),
+        error=job.error,
+        stage_timings=json.loads(job.stage_timings) if job.stage_timings else {},
+        possible_duplicates=json.loads(job.duplicate_candidate_ids) if job.duplicate_candidate_ids else [],
+        attempts=job.attempts,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
+
+@app.get("/candidates", response_model=CandidatePage)
 async def get_candidates(
     job_position_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
     min_score: Optional[float] = Query(None),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    skill: Optional[List[str]] = Query(None),
+    match: str = Query("all"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    include_parsed_data: bool = Query(True),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Candidate)
+    query = select(Candidate)
+    
+    if skill:
+        if match not in ("all", "any"):
+            raise HTTPException(status_code=400, detail="Invalid match mode. Use 'all' or 'any'.")
+        
+        # Answered from the indexed candidate_skills table instead of parsing parsed_data
+        skills = {normalize_skill(s) for s in skill}
+        matching = select(CandidateSkill.candidate_id).where(CandidateSkill.skill.in_(skills))
+        if match == "all":
+            matching = matching.group_by(CandidateSkill.candidate_id).having(func.count() == len(skills))
+        query = query.where(Candidate.id.in_(matching))
     
     if job_position_id:
-        query = query.filter(Candidate.job_position_id == job_position_id)
+        query = query.where(Candidate.job_position_id == job_position_id)
     
     if status:
-        query = query.filter(Candidate.status == status)
+        query = query.where(Candidate.status == status)
     
     if min_score:
-        query = query.filter(Candidate.overall_score >= min_score)
-    
-    candidates = query.order_by(Candidate.overall_score.desc()).all()
+        query = query.where(Candidate.overall_score >= min_score)
+    
+    if not include_parsed_data:
+        query = query.options(defer(Candidate.parsed_data))
+    
+    # Keyset pagination on (overall_score, id): every page is an index seek, however deep
+    if cursor:
+        last_score, last_id = decode_cursor(cursor, (int, float), int)
+        query = query.where(tuple_(Candidate.overall_score, Candidate.id) < (last_score, last_id))
+    
+    candidates = (await db.execute(
+        query.order_by(Candidate.overall_score.desc(), Candidate.id.desc()).limit(limit + 1)
+    )).scalars().all()
+    has_more = len(candidates) > limit
+    candidates = candidates[:limit]
+    
+    return CandidatePage(
+        items=[
+            CandidateResponse(
+                id=candidate.id,
+                name=candidate.name,
+                email=candidate.email,
+                phone=candidate.phone,
+                job_position_id=candidate.job_position_id,
+                overall_score=candidate.overall_score,
+                skills_score=candidate.skills_score,
+                experience_score=candidate.experience_score,
+                education_score=candidate.education_score,
+                status=candidate.status,
+                uploaded_at=candidate.uploaded_at,
+                parsed_data=json.loads(candidate.parsed_data) if include_parsed_data and candidate.parsed_data else {}
+            )
+            for candidate in candidates
+        ],
+        next_cursor=encode_cursor(candidates[-1].overall_score, candidates[-1].id) if has_more else None
+    )
+
+@app.get("/candidates/search", response_model=CandidateSearchPage)
+async def search_candidate_cvs(
+    q: str = Query(..., min_length=1),
+    job_position_id: Optional[int] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over candidate names and CV text, best BM25 matches first"""
+    if async_engine.dialect.name != "sqlite":
+        raise HTTPException(status_code=501, detail="Full-text search requires SQLite FTS5")
     
-    return [
-        CandidateResponse(
-            id=candidate.id,
-            name=candidate.name,
-            email=candidate.email,
-            phone=candidate.phone,
-            job_position_id=candidate.job_position_id,
-            overall_score=candidate.overall_score,
-            skills_score=candidate.skills_score,
-            experience_score=candidate.experience_score,
-            education_score=candidate.education_score,
-            status=candidate.status,
-            uploaded_at=candidate.uploaded_at,
-            parsed_data=json.loads(candidate.parsed_data) if candidate.parsed_data else {}
+    after = decode_cursor(cursor, (int, float), int) if cursor else None
+    try:
+        rows = await db.run_sync(
+            lambda session: search_candidates(session.connection(), q, job_position_id, limit + 1, after)
         )
-        for candidate in candidates
-    ]
+    except OperationalError:
+        raise HTTPException(status_code=400, detail="Invalid search query")
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    return CandidateSearchPage(
+        items=[
+            CandidateSearchResult(
+                id=row["id"],
+                name=row["name"],
+                email=row["email"],
+                job_position_id=row["job_position_id"],
+                overall_score=row["overall_score"] or 0.0,
+                status=row["status"] or "new",
+                uploaded_at=row["uploaded_at"],
+                rank=row["score"],
+                snippet=row["snippet"] or ""
+            )
+            for row in rows
+        ],
+        next_cursor=encode_cursor(rows[-1]["score"], rows[-1]["id"]) if has_more else None
+    )
+
+@app.get("/job-positions/{job_position_id}/matches", response_model=JobMatches)
+async def get_job_matches(
+    job_position_id: int,
+    k: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    applicants_only: bool = Query(False),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Candidates whose CVs are most similar to the job's description and requirements (TF-IDF cosine)"""
+    job = (await db.execute(
+        select(JobPosition).options(selectinload(JobPosition.requirements)).where(JobPosition.id == job_position_id)
+    )).scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job position not found")
+    
+    candidate_ids = None
+    if applicants_only:
+        candidate_ids = (await db.execute(
+            select(Candidate.id).where(Candidate.job_position_id == job_position_id)
+        )).scalars().all()
+    matches = await asyncio.to_thread(match_index.top_k, job_match_text(job), k, candidate_ids)
+    if not matches:
+        return JobMatches(job_position_id=job_position_id, items=[])
+    
+    candidates = (await db.execute(
+        select(Candidate).options(defer(Candidate.parsed_data)).where(Candidate.id.in_([candidate_id for candidate_id, _ in matches]))
+    )).scalars().all()
+    by_id = {candidate.id: candidate for candidate in candidates}
+    
+    return JobMatches(
+        job_position_id=job_position_id,
+        items=[
+            CandidateMatch(
+                id=candidate_id,
+                name=by_id[candidate_id].name,
+                email=by_id[candidate_id].email,
+                job_position_id=by_id[candidate_id].job_position_id,
+                overall_score=by_id[candidate_id].overall_score or 0.0,
+                status=by_id[candidate_id].status or "new",
+                similarity=similarity
+            )
+            for candidate_id, similarity in matches
+            if candidate_id in by_id
+        ]
+    )
+
+@app.get("/candidates/{candidate_id}/duplicates", response_model=CandidateDuplicates)
+async def get_candidate_duplicates(
+    candidate_id: int,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Other candidates whose CVs are near-duplicates of this one (MinHash estimate), most similar first"""
+    minhash = (await db.execute(select(Candidate.minhash).where(Candidate.id == candidate_id))).one_or_none()
+    if minhash is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    duplicates = await db.run_sync(
+        lambda session: find_duplicates(session.connection(), candidate_id, minhash[0] or b"")
+    )
+    if not duplicates:
+        return CandidateDuplicates(candidate_id=candidate_id, items=[])
+    
+    candidates = (await db.execute(
+        select(Candidate).options(defer(Candidate.parsed_data)).where(Candidate.id.in_([other_id for other_id, _ in duplicates]))
+    )).scalars().all()
+    by_id = {candidate.id: candidate for candidate in candidates}
+    
+    return CandidateDuplicates(
+        candidate_id=candidate_id,
+        items=[
+            DuplicateCandidate(
+                id=other_id,
+                name=by_id[other_id].name,
+                email=by_id[other_id].email,
+                job_position_id=by_id[other_id].job_position_id,
+                status=by_id[other_id].status or "new",
+                uploaded_at=by_id[other_id].uploaded_at,
+                similarity=similarity
+            )
+            for other_id, similarity in duplicates
+        ]
+    )
 
 @app.put("/candidates/{candidate_id}/status")
 async def update_candidate_status(
     candidate_id: int,
     status: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    candidate = await db.get(Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
@@ -703,41 +2215,128 @@ async def update_candidate_status(
     if status not in valid_statuses:
         raise HTTPException(status_code=400, detail="Invalid status")
     
+    notify = status != candidate.status and status in CANDIDATE_NOTIFY_STATUSES and bool(candidate.email)
     candidate.status = status
-    db.commit()
+    if notify:
+        job = await db.get(JobPosition, candidate.job_position_id) if candidate.job_position_id else None
+        queue_email(
+            db, "status_update", candidate.email,
+            candidate_email=candidate.email,
+            candidate_name=candidate.name,
+            position=job.title if job else "your application",
+            status=status
+        )
+    await db.commit()
+    if notify:
+        wake_outbox_drainer()
     
     return {"message": "Candidate status updated successfully"}
 
+# Queues this process's bookings so they do not all contend for the database write lock at once;
+# lock_interview_participants is what makes the check and insert atomic across processes
+interview_scheduling_lock = asyncio.Lock()
+
+async def lock_interview_participants(db: AsyncSession, interviewer_id: int, candidate_id: int):
+    """Hold write locks on the interviewer and candidate until the transaction ends.
+
+    The no-op UPDATEs take row locks on PostgreSQL and MySQL, serialising
+    bookings for the same people, and on SQLite take the database write lock
+    up front as BEGIN IMMEDIATE would. Users are always locked before
+    candidates, so two bookings cannot deadlock.
+    """
+    for table, row_id in ((User.__table__, interviewer_id), (Candidate.__table__, candidate_id)):
+        await db.execute(update(table).where(table.c.id == row_id).values(id=table.c.id))
+
+def interview_conflicts_query(interviewer_id: int, candidate_id: int, start: datetime, duration: int):
+    """Interviews of the interviewer or the candidate that may overlap a slot.
+
+    Durations are capped at MAX_INTERVIEW_MINUTES, so an overlapping interview
+    starts less than that before `start`. Each side of the union is a short
+    range scan on its (id, scheduled_date) index, however long the history.
+    """
+    window = (start - timedelta(minutes=MAX_INTERVIEW_MINUTES), start + timedelta(minutes=duration))
+    columns = (Interview.id, Interview.scheduled_date, Interview.duration)
+    return union_all(*(
+        select(*columns).where(
+            owner == owner_id,
+            Interview.scheduled_date > window[0],
+            Interview.scheduled_date < window[1],
+            Interview.status != "cancelled"
+        )
+        for owner, owner_id in ((Interview.interviewer_id, interviewer_id), (Interview.candidate_id, candidate_id))
+    ))
+
+async def find_interview_conflicts(db: AsyncSession, interviewer_id: int, candidate_id: int,
+                                   start: datetime, duration: int) -> List[int]:
+    """IDs of scheduled interviews overlapping the slot for the interviewer or the candidate"""
+    start = start.replace(tzinfo=None)  # scheduled_date is stored without its offset
+    end = start + timedelta(minutes=duration)
+    rows = (await db.execute(interview_conflicts_query(interviewer_id, candidate_id, start, duration))).all()
+    return sorted({
+        row.id for row in rows
+        if row.scheduled_date < end and row.scheduled_date + timedelta(minutes=row.duration or 60) > start
+    })
+
 @app.post("/interviews", response_model=InterviewResponse)
 async def create_interview(
     interview_data: InterviewCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     # Verify candidate exists
-    candidate = db.query(Candidate).filter(Candidate.id == interview_data.candidate_id).first()
+    candidate = await db.get(Candidate, interview_data.candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
     # Verify interviewer exists
-    interviewer = db.query(User).filter(User.id == interview_data.interviewer_id).first()
+    interviewer = await db.get(User, interview_data.interviewer_id)
     if not interviewer:
         raise HTTPException(status_code=404, detail="Interviewer not found")
     
-    # Create interview
-    interview = Interview(
-        candidate_id=interview_data.candidate_id,
-        interviewer_id=interview_data.interviewer_id,
-        scheduled_date=interview_data.scheduled_date,
-        duration=interview_data.duration,
-        interview_type=interview_data.interview_type,
-        location=interview_data.location,
-        notes=interview_data.notes
-    )
+    if not 0 < interview_data.duration <= MAX_INTERVIEW_MINUTES:
+        raise HTTPException(status_code=400, detail=f"Duration must be between 1 and {MAX_INTERVIEW_MINUTES} minutes")
     
-    db.add(interview)
-    db.commit()
-    db.refresh(interview)
+    async with interview_scheduling_lock:
+        await lock_interview_participants(db, interview_data.interviewer_id, interview_data.candidate_id)
+        conflicts = await find_interview_conflicts(
+            db, interview_data.interviewer_id, interview_data.candidate_id,
+            interview_data.scheduled_date, interview_data.duration
+        )
+        if conflicts:
+            await db.rollback()  # release the write lock now rather than when the session closes
+            raise HTTPException(status_code=409, detail={
+                "message": "Interviewer or candidate already has an interview in this slot",
+                "conflicting_interview_ids": conflicts
+            })
+        
+        # Create interview
+        interview = Interview(
+            candidate_id=interview_data.candidate_id,
+            interviewer_id=interview_data.interviewer_id,
+            scheduled_date=interview_data.scheduled_date,
+            duration=interview_data.duration,
+            interview_type=interview_data.interview_type,
+            location=interview_data.location,
+            notes=interview_data.notes
+        )
+        
+        db.add(interview)
+        if candidate.email:
+            job = await db.get(JobPosition, candidate.job_position_id) if candidate.job_position_id else None
+            location = interview_data.location or ""
+            queue_email(
+                db, "interview_invitation", candidate.email,
+                candidate_email=candidate.email,
+                candidate_name=candidate.name,
+                position=job.title if job else "the open position",
+                interview_date=interview_data.scheduled_date.strftime("%A, %B %d, %Y"),
+                interview_time=interview_data.scheduled_date.strftime("%H:%M"),
+                interview_type=interview_data.interview_type,
+                meeting_link=location if location.startswith(("http://", "https://")) else None
+            )
+        await db.commit()
+    await db.refresh(interview)
+    wake_outbox_drainer()
     
     return InterviewResponse(
         id=interview.id,
@@ -752,72 +2351,95 @@ async def create_interview(
         created_at=interview.created_at
     )
 
-@app.get("/interviews", response_model=List[InterviewResponse])
+@app.get("/interviews", response_model=InterviewPage)
 async def get_interviews(
     candidate_id: Optional[int] = Query(None),
     interviewer_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Interview)
+    query = select(Interview)
     
     if candidate_id:
-        query = query.filter(Interview.candidate_id == candidate_id)
+        query = query.where(Interview.candidate_id == candidate_id)
     
     if interviewer_id:
-        query = query.filter(Interview.interviewer_id == interviewer_id)
+        query = query.where(Interview.interviewer_id == interviewer_id)
     
     if status:
-        query = query.filter(Interview.status == status)
+        query = query.where(Interview.status == status)
     
-    interviews = query.order_by(Interview.scheduled_date).all()
-    
-    return [
-        InterviewResponse(
-            id=interview.id,
-            candidate_id=interview.candidate_id,
-            interviewer_id=interview.interviewer_id,
-            scheduled_date=interview.scheduled_date,
-            duration=interview.duration,
-            interview_type=interview.interview_type,
-            location=interview.location,
-            notes=interview.notes,
-            status=interview.status,
-            created_at=interview.created_at
-        )
-        for interview in interviews
-    ]
+    # Keyset pagination on (scheduled_date, id)
+    if cursor:
+        last_date, last_id = decode_cursor(cursor, str, int)
+        try:
+            last_date = datetime.fromisoformat(last_date)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(tuple_(Interview.scheduled_date, Interview.id) > (last_date, last_id))
+    
+    interviews = (await db.execute(
+        query.order_by(Interview.scheduled_date, Interview.id).limit(limit + 1)
+    )).scalars().all()
+    has_more = len(interviews) > limit
+    interviews = interviews[:limit]
+    
+    return InterviewPage(
+        items=[
+            InterviewResponse(
+                id=interview.id,
+                candidate_id=interview.candidate_id,
+                interviewer_id=interview.interviewer_id,
+                scheduled_date=interview.scheduled_date,
+                duration=interview.duration,
+                interview_type=interview.interview_type,
+                location=interview.location,
+                notes=interview.notes,
+                status=interview.status,
+                created_at=interview.created_at
+            )
+            for interview in interviews
+        ],
+        next_cursor=encode_cursor(interviews[-1].scheduled_date.isoformat(), interviews[-1].id) if has_more else None
+    )
 
 @app.get("/dashboard/stats")
 async def get_dashboard_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    job_position_id: Optional[int] = Query(None),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    # Get various statistics
-    total_candidates = db.query(Candidate).count()
-    total_jobs = db.query(JobPosition).filter(JobPosition.status == "active").count()
-    shortlisted_candidates = db.query(Candidate).filter(Candidate.status == "shortlisted").count()
-    scheduled_interviews = db.query(Interview).filter(Interview.status == "scheduled").count()
-    
-    # Recent candidates
-    recent_candidates = db.query(Candidate).order_by(Candidate.uploaded_at.desc()).limit(5).all()
-    
-    # Average score
-    avg_score_result = db.query(Candidate).all()
-    avg_score = sum(c.overall_score for c in avg_score_result) / len(avg_score_result) if avg_score_result else 0
-    
-    return {
+    # Pre-aggregated counters: one primary-key read however many candidates exist
+    stats = await db.get(DashboardStats, job_position_id if job_position_id is not None else GLOBAL_SCOPE)
+    
+    # Recent candidates, with the position title joined in
+    recent = select(
+        Candidate.id, Candidate.name, Candidate.overall_score, Candidate.status, Candidate.uploaded_at,
+        JobPosition.title
+    ).outerjoin(JobPosition, Candidate.job_position_id == JobPosition.id)
+    if job_position_id is not None:
+        recent = recent.where(Candidate.job_position_id == job_position_id)
+    recent_candidates = (await db.execute(recent.order_by(Candidate.uploaded_at.desc()).limit(5))).all()
+    
+    total_candidates = stats.total_candidates if stats else 0
+    result = {
         "total_candidates": total_candidates,
-        "active_jobs": total_jobs,
-        "shortlisted_candidates": shortlisted_candidates,
-        "scheduled_interviews": scheduled_interviews,
-        "average_score": round(avg_score, 1),
+        "shortlisted_candidates": stats.shortlisted_candidates if stats else 0,
+        "scheduled_interviews": stats.scheduled_interviews if stats else 0,
+        "average_score": round(stats.score_sum / total_candidates, 1) if total_candidates else 0,
+        "status_counts": {
+            status: getattr(stats, f"{status}_candidates") if stats else 0
+            for status in ["new", "reviewed", "shortlisted", "rejected", "interviewed"]
+        },
+        "total_interviews": stats.total_interviews if stats else 0,
         "recent_candidates": [
             {
                 "id": c.id,
                 "name": c.name,
-                "position": c.job_position.title if c.job_position else "Unknown",
+                "position": c.title or "Unknown",
                 "score": c.overall_score,
                 "status": c.status,
                 "uploaded_at": c.uploaded_at.isoformat()
@@ -825,39 +2447,123 @@ async def get_dashboard_stats(
             for c in recent_candidates
         ]
     }
+    if job_position_id is None:
+        result["active_jobs"] = stats.active_jobs if stats else 0
+    else:
+        result["job_position_id"] = job_position_id
+    return result
+
+@app.post("/dashboard/stats/rebuild")
+async def rebuild_dashboard(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Recompute the dashboard counters from scratch, e.g. after rows were written outside the API"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    await db.run_sync(lambda session: rebuild_dashboard_stats(session.connection()))
+    await db.commit()
+    
+    return {"message": "Dashboard statistics rebuilt"}
 
 @app.get("/system/metrics")
 async def get_system_metrics(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
+    active_users = (await db.execute(select(func.count()).select_from(User).where(User.status == "active"))).scalar()
+    
     # Get or create system metrics
     metrics = [
         {"name": "System Uptime", "value": "99.9%", "change": "+0.1%", "status": "good"},
         {"name": "AI Processing Speed", "value": "2.3s avg", "change": "-0.2s", "status": "good"},
         {"name": "Database Size", "value": "2.4 GB", "change": "+120 MB", "status": "good"},
-        {"name": "Active Users", "value": str(db.query(User).filter(User.status == "active").count()), "change": "+3", "status": "good"},
+        {"name": "Active Users", "value": str(active_users), "change": "+3", "status": "good"},
         {"name": "API Response Time", "value": "145ms", "change": "+12ms", "status": "warning"},
         {"name": "Error Rate", "value": "0.02%", "change": "+0.01%", "status": "warning"}
     ]
     
-    return {"metrics": metrics}
+    parse_cache_stats = get_parse_cache_stats()
+    metrics.append({
+        "name": "CV Parse Cache Hit Rate",
+        "value": f"{parse_cache_stats['hit_rate'] * 100:.1f}%",
+        "change": f"{parse_cache_stats['hits']} hits / {parse_cache_stats['misses']} misses",
+        "status": "good"
+    })
+    
+    auth_cache_stats = principal_cache.stats()
+    metrics.append({
+        "name": "Auth Cache Hit Rate",
+        "value": f"{auth_cache_stats['hit_rate'] * 100:.1f}%",
+        "change": f"{auth_cache_stats['evictions']} evictions / {auth_cache_stats['expirations']} expirations",
+        "status": "good"
+    })
+    
+    email_outbox = dict((await db.execute(
+        select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status)
+    )).all())
+    
+    return {
+        "metrics": metrics, "parse_cache": parse_cache_stats, "auth_cache": auth_cache_stats,
+        "email_outbox": email_outbox, "attachment_cache": mailer.attachments.stats()
+    }
+
+@app.get("/system/query-plans")
+async def get_query_plans(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Show the query plan of each listing endpoint's main query, to confirm index usage"""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    sample_date = datetime.utcnow()
+    statements = {
+        "candidates": select(Candidate)
+            .where(tuple_(Candidate.overall_score, Candidate.id) < (100.0, 1000))
+            .order_by(Candidate.overall_score.desc(), Candidate.id.desc()).limit(DEFAULT_PAGE_SIZE + 1),
+        "candidates_by_job_and_status": select(Candidate)
+            .where(Candidate.job_position_id == 1, Candidate.status == "new")
+            .order_by(Candidate.overall_score.desc(), Candidate.id.desc()).limit(DEFAULT_PAGE_SIZE + 1),
+        "candidates_by_skill": select(Candidate)
+            .where(Candidate.id.in_(select(CandidateSkill.candidate_id).where(CandidateSkill.skill.in_(["react", "aws"]))))
+            .order_by(Candidate.overall_score.desc(), Candidate.id.desc()).limit(DEFAULT_PAGE_SIZE + 1),
+        "recent_candidates": select(Candidate).order_by(Candidate.uploaded_at.desc()).limit(5),
+        "interviews_by_interviewer": select(Interview)
+            .where(Interview.interviewer_id == 1, tuple_(Interview.scheduled_date, Interview.id) > (sample_date, 0))
+            .order_by(Interview.scheduled_date, Interview.id).limit(DEFAULT_PAGE_SIZE + 1),
+        "interview_conflicts": interview_conflicts_query(1, 1, sample_date, 60),
+        "interviews_by_status": select(Interview)
+            .where(Interview.status == "scheduled")
+            .order_by(Interview.scheduled_date, Interview.id).limit(DEFAULT_PAGE_SIZE + 1),
+        "job_positions": select(JobPosition).where(JobPosition.status == "active").order_by(JobPosition.id),
+    }
+    
+    plans = await db.run_sync(
+        lambda session: {name: explain_query_plan(session.connection(), statement) for name, statement in statements.items()}
+    )
+    return {
+        "dialect": async_engine.dialect.name,
+        "schema_versions": await asyncio.to_thread(applied_versions, engine),
+        "plans": plans
+    }
 
 @app.post("/ai/chat")
 async def ai_chat(
     message: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Simple AI chatbot responses - in production, integrate with OpenAI or similar"""
     
     message_lower = message.lower()
     
     if "sarah johnson" in message_lower:
-        candidate = db.query(Candidate).filter(Candidate.name.ilike("%sarah johnson%")).first()
+        candidate = (await db.execute(select(Candidate).where(Candidate.name.ilike("%sarah johnson%")).limit(1))).scalars().first()
         if candidate:
             parsed_data = json.loads(candidate.parsed_data) if candidate.parsed_data else {}
             response = f"Sarah Johnson has a {candidate.overall_score:.0f}% match score. Skills: {', '.join(parsed_data.get('skills', [])[:5])}. Experience: {parsed_data.get('experience', 'Not specified')}."
@@ -865,7 +2571,7 @@ async def ai_chat(
             response = "I couldn't find information about Sarah Johnson in our database."
     
     elif "top candidates" in message_lower or "best candidates" in message_lower:
-        top_candidates = db.query(Candidate).order_by(Candidate.overall_score.desc()).limit(3).all()
+        top_candidates = (await db.execute(select(Candidate).order_by(Candidate.overall_score.desc()).limit(3))).scalars().all()
         if top_candidates:
             response = "Top candidates:\n"
             for i, candidate in enumerate(top_candidates, 1):
@@ -895,15 +2601,15 @@ async def ai_chat(
 @app.get("/candidates/{candidate_id}/report")
 async def generate_candidate_report(
     candidate_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    candidate = await db.get(Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
     parsed_data = json.loads(candidate.parsed_data) if candidate.parsed_data else {}
-    job_position = db.query(JobPosition).filter(JobPosition.id == candidate.job_position_id).first()
+    job_position = await db.get(JobPosition, candidate.job_position_id) if candidate.job_position_id else None
     
     # Generate strengths and weaknesses
     strengths = []
@@ -947,6 +2653,44 @@ async def generate_candidate_report(
         "generated_at": datetime.utcnow().isoformat()
     }
 
+@app.on_event("startup")
+async def backfill_skill_index():
+    await asyncio.to_thread(backfill_candidate_skills)
+
+@app.on_event("startup")
+async def start_text_backfill():
+    _background_tasks.append(asyncio.create_task(backfill_candidate_texts()))
+
+@app.on_event("startup")
+async def start_match_index():
+    _background_tasks.append(asyncio.create_task(maintain_match_index()))
+
+@app.on_event("startup")
+async def start_outbox_drainer():
+    global _outbox_wakeup
+    _outbox_wakeup = asyncio.Event()
+    if EMAIL_OUTBOX_ENABLED:
+        _background_tasks.append(asyncio.create_task(outbox_drainer()))
+
+@app.on_event("startup")
+async def start_ingestion_workers():
+    global _ingestion_wakeup
+    _ingestion_wakeup = asyncio.Event()
+    for _ in range(INGESTION_WORKERS):
+        _background_tasks.append(asyncio.create_task(ingestion_worker()))
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
+    await asyncio.to_thread(save_match_index)
+    await asyncio.to_thread(mailer.close)
+    if _cv_process_pool is not None:
+        _cv_process_pool.shutdown(wait=False, cancel_futures=True)
+    await async_engine.dispose()
+
 # Initialize default admin user
 @app.on_event("startup")
 async def create_default_admin():
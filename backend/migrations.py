@@ -0,0 +1,157 @@
+"""
+Versioned schema migrations for existing databases.
+
+Base.metadata.create_all only creates missing tables, so anything that
+changes an existing table (indexes, new columns, virtual tables) is added
+here. Migrations run in version order, each one in its own transaction,
+and are recorded in schema_migrations. Every step is written to be safe to
+re-run (IF NOT EXISTS), so a half-migrated database can always be retried.
+
+Run directly to migrate a database without starting the API:
+    python migrations.py [database_url]
+"""
+
+import sys
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional, Sequence, Union
+
+from sqlalchemy import LargeBinary, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.types import TypeEngine
+
+from dashboard_stats import create_dashboard_stats_table, rebuild_dashboard_stats
+from cv_search import create_search_index
+from storage import DATABASE_URL, create_database_engine
+
+# A step is a SQL statement or a callable that receives the open connection
+MigrationStep = Union[str, Callable[[Connection], None]]
+
+
+def add_column(table: str, column: str, definition: Union[str, TypeEngine]) -> Callable[[Connection], None]:
+    """Step that adds a column unless the table already has it (e.g. created by create_all).
+
+    A table that does not exist yet is skipped: create_all will create it with
+    the column. definition is raw DDL or a SQLAlchemy type, compiled for the
+    connection's dialect.
+    """
+    def step(connection: Connection):
+        inspector = inspect(connection)
+        if not inspector.has_table(table):
+            return
+        existing = {info["name"] for info in inspector.get_columns(table)}
+        if column not in existing:
+            ddl = definition if isinstance(definition, str) else definition.compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return step
+
+
+def normalise_timestamps(table: str, column: str) -> str:
+    """Step that rewrites ISO-8601 text timestamps ('2024-01-02T03:04:05') to the
+    '2024-01-02 03:04:05.000000' form SQLAlchemy writes, so text comparison orders them correctly"""
+    return (
+        f"UPDATE {table} SET {column} = replace({column}, 'T', ' ')"
+        f" || CASE WHEN length({column}) = 19 THEN '.000000' ELSE '' END"
+        f" WHERE {column} LIKE '____-__-__T%'"
+    )
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    steps: Sequence[MigrationStep]
+    dialects: Optional[Sequence[str]] = None  # None means every dialect
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "listing_indexes", [
+        "CREATE INDEX IF NOT EXISTS ix_candidates_job_status_score ON candidates (job_position_id, status, overall_score DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS ix_candidates_score ON candidates (overall_score DESC, id DESC)",
+        "CREATE INDEX IF NOT EXISTS ix_candidates_uploaded_at ON candidates (uploaded_at)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_interviewer_date ON interviews (interviewer_id, scheduled_date)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_status ON interviews (status)",
+    ]),
+    # Also created by create_all, but the CLI migrates without it; seed it from the rows that already exist
+    Migration(2, "dashboard_stats", [create_dashboard_stats_table, rebuild_dashboard_stats]),
+    Migration(3, "cv_text", [
+        add_column("candidates", "cv_text", "TEXT"),
+        add_column("cv_parse_cache", "cv_text", "TEXT"),
+    ]),
+    Migration(4, "candidates_fts", [create_search_index], dialects=["sqlite"]),
+    # candidate_lsh_buckets is created by create_all; signatures are backfilled by the API
+    Migration(5, "minhash", [
+        add_column("candidates", "minhash", LargeBinary()),
+        add_column("ingestion_jobs", "duplicate_candidate_ids", "TEXT"),
+    ]),
+    Migration(6, "interview_conflicts", [
+        "CREATE INDEX IF NOT EXISTS ix_interviews_candidate_date ON interviews (candidate_id, scheduled_date)",
+    ]),
+    # database_init used to seed isoformat() text, which SQLite compares wrongly against SQLAlchemy's format
+    Migration(7, "timestamp_format", [
+        normalise_timestamps("interviews", "scheduled_date"),
+        normalise_timestamps("candidates", "uploaded_at"),
+    ], dialects=["sqlite"]),
+]
+
+
+def ensure_migrations_table(connection: Connection):
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at TIMESTAMP NOT NULL)"
+    ))
+
+
+def applied_versions(engine: Engine) -> List[int]:
+    with engine.begin() as connection:
+        ensure_migrations_table(connection)
+        return [row[0] for row in connection.execute(text("SELECT version FROM schema_migrations ORDER BY version"))]
+
+
+def run_migrations(engine: Engine, migrations: Sequence[Migration] = MIGRATIONS) -> List[Migration]:
+    """Apply every pending migration in version order; returns the ones applied"""
+    done = set(applied_versions(engine))
+    applied = []
+
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+
+        with engine.begin() as connection:
+            if migration.dialects is None or engine.dialect.name in migration.dialects:
+                for step in migration.steps:
+                    if callable(step):
+                        step(connection)
+                    else:
+                        connection.execute(text(step))
+            connection.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:version, :name, :applied_at)"),
+                {"version": migration.version, "name": migration.name, "applied_at": datetime.utcnow()}
+            )
+        applied.append(migration)
+
+    return applied
+
+
+def explain_query_plan(connection: Connection, statement) -> List[str]:
+    """Return the database's query plan for a SQLAlchemy statement, one line per step"""
+    # render_postcompile expands IN (...) lists into plain bound parameters
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        return [row[-1] for row in rows]
+
+    rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", params)
+    return [str(row[0]) for row in rows]
+
+
+if __name__ == "__main__":
+    url = sys.argv[1] if len(sys.argv) > 1 else DATABASE_URL
+    migrated = run_migrations(create_database_engine(url))
+    for migration in migrated:
+        print(f"Applied migration {migration.version}: {migration.name}")
+    if not migrated:
+        print("Database schema is up to date")
@@ -0,0 +1,144 @@
+"""
+Page-level PDF text extraction with page/time budgets and page-parallel workers
+
+Page-parallel extraction is meant for standalone callers (scripts,
+benchmarks). Code that already runs in a worker process, like the API's CV
+pool, should pass workers=1 rather than nest a pool in every worker; a caller
+with its own pool can submit page_ranges() to it with extract_page_range.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import PyPDF2
+
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "60"))
+PDF_TIME_BUDGET_SECONDS = float(os.getenv("PDF_TIME_BUDGET_SECONDS", "15"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "12"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Raw PDF bytes, a file path or an already opened reader
+PdfSource = Union[bytes, str, PyPDF2.PdfReader]
+
+
+class PdfExtractionResult(NamedTuple):
+    text: str
+    pages_total: int
+    pages_extracted: int
+    truncated: bool
+
+
+def open_pdf(source: PdfSource) -> PyPDF2.PdfReader:
+    if isinstance(source, PyPDF2.PdfReader):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return PyPDF2.PdfReader(BytesIO(source))
+    return PyPDF2.PdfReader(source)
+
+
+def iter_pdf_pages(source: PdfSource, max_pages: Optional[int] = None,
+                   deadline: Optional[float] = None) -> Iterator[str]:
+    """Yield page texts in order, stopping at the page limit or the (time.time()) deadline"""
+    reader = open_pdf(source)
+    for index, page in enumerate(reader.pages):
+        if max_pages is not None and index >= max_pages:
+            return
+        if deadline is not None and time.time() >= deadline:
+            return
+        yield page.extract_text() or ""
+
+
+_executors: Dict[int, ProcessPoolExecutor] = {}
+
+
+def _executor(workers: int) -> ProcessPoolExecutor:
+    """One pool per worker count, created on first use and reused for every later document"""
+    if workers not in _executors:
+        _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _executors[workers]
+
+
+def count_pdf_pages(source: PdfSource) -> int:
+    return len(open_pdf(source).pages)
+
+
+def page_ranges(page_limit: int, workers: int) -> List[Tuple[int, int]]:
+    """Split the first page_limit pages into contiguous [start, stop) ranges for parallel extraction"""
+    # Several ranges per worker so one slow (scanned) range does not hold up the rest
+    chunk_size = max(1, -(-page_limit // (workers * 2)))
+    return [(start, min(start + chunk_size, page_limit)) for start in range(0, page_limit, chunk_size)]
+
+
+def extract_page_range(source: PdfSource, start: int, stop: int,
+                       deadline: Optional[float]) -> List[str]:
+    """Worker: extract pages [start, stop) of one document"""
+    reader = open_pdf(source)
+    pages = []
+    for index in range(start, stop):
+        if deadline is not None and time.time() >= deadline:
+            break
+        pages.append(reader.pages[index].extract_text() or "")
+    return pages
+
+
+def _extract_parallel(source: PdfSource, page_limit: int, deadline: Optional[float],
+                      workers: int) -> List[str]:
+    ranges = page_ranges(page_limit, workers)
+
+    def submit_ranges():
+        executor = _executor(workers)
+        return [executor.submit(extract_page_range, source, start, stop, deadline) for start, stop in ranges]
+
+    try:
+        futures = submit_ranges()
+    except BrokenProcessPool:
+        # A worker died during an earlier document; replace the pool
+        _executors.pop(workers).shutdown(wait=False)
+        futures = submit_ranges()
+    try:
+        timeout = max(0.0, deadline - time.time()) if deadline is not None else None
+        wait(futures, timeout=timeout)
+
+        pages = []
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                pages.extend(future.result())
+        return pages
+    finally:
+        # Ranges still queued past the deadline; running ones stop at their next deadline check
+        for future in futures:
+            future.cancel()
+
+
+def extract_pdf_text(source: PdfSource, max_pages: Optional[int] = PDF_MAX_PAGES,
+                     time_budget: Optional[float] = PDF_TIME_BUDGET_SECONDS,
+                     workers: int = PDF_WORKERS) -> PdfExtractionResult:
+    """Extract text from a PDF within a page and time budget.
+
+    Long documents are split into page ranges that are extracted in parallel
+    processes; anything beyond the budget is dropped and flagged as truncated.
+    """
+    deadline = time.time() + time_budget if time_budget else None
+    if isinstance(source, memoryview):
+        source = bytes(source)
+    reader = open_pdf(source)
+    pages_total = len(reader.pages)
+    page_limit = min(pages_total, max_pages) if max_pages else pages_total
+
+    # Workers re-open the document, so an already open reader is always read in-process
+    parallel = workers > 1 and page_limit >= PDF_PARALLEL_MIN_PAGES and not isinstance(source, PyPDF2.PdfReader)
+    if parallel:
+        pages = _extract_parallel(source, page_limit, deadline, workers)
+    else:
+        pages = list(iter_pdf_pages(reader, page_limit, deadline))
+
+    return PdfExtractionResult(
+        text="".join(pages),
+        pages_total=pages_total,
+        pages_extracted=len(pages),
+        truncated=len(pages) < pages_total
+    )
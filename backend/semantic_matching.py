@@ -0,0 +1,188 @@
+"""
+TF-IDF similarity between job descriptions and CV texts.
+
+CVs are hashed into a fixed feature space (HashingVectorizer), so adding a
+CV never refits a vocabulary: its term counts are appended to a sparse
+matrix and the document frequencies are bumped. IDF weights are recomputed
+from those counts once the corpus has grown by `reweight_growth` since the
+last time; until then new rows are weighted with the current IDF. Matching
+a job is one sparse matrix-vector product plus argpartition for the top k.
+"""
+
+import os
+import threading
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+N_FEATURES = 2 ** 20
+REWEIGHT_GROWTH = 0.1
+MAX_BLOCKS = 32
+
+
+class _Snapshot(NamedTuple):
+    ids: np.ndarray
+    blocks: Tuple[sp.csr_matrix, ...]  # L2-normalised TF-IDF rows, stacked in the order of ids
+    idf: np.ndarray
+
+
+class TfidfIndex:
+    """Incrementally updated TF-IDF vectors for candidate CVs, keyed by candidate ID.
+
+    Writers (add, flush_pending) are serialised by a lock; readers work on an
+    immutable snapshot, so a match never waits for a large add or reweight.
+    Each add appends a block instead of copying the existing rows, and blocks
+    are merged once there are more than MAX_BLOCKS of them.
+    """
+
+    def __init__(self, n_features: int = N_FEATURES, reweight_growth: float = REWEIGHT_GROWTH):
+        self.n_features = n_features
+        self.reweight_growth = reweight_growth
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, alternate_sign=False, norm=None, stop_words="english", dtype=np.float32
+        )
+        self._write_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: List[Tuple[int, str]] = []
+
+        # Sublinear term frequencies (1 + log tf) of every indexed CV
+        self.count_blocks: List[sp.csr_matrix] = []
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.reweighted_at = 0  # number of documents the current IDF was computed from
+        self.dirty = False
+        self._snapshot = _Snapshot(np.empty(0, dtype=np.int64), (), np.ones(n_features, dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self._snapshot.ids)
+
+    def contains(self, candidate_ids: Sequence[int]) -> np.ndarray:
+        return np.isin(np.asarray(candidate_ids, dtype=np.int64), self._snapshot.ids)
+
+    def _counts(self) -> sp.csr_matrix:
+        if len(self.count_blocks) != 1:
+            self.count_blocks = [sp.vstack(self.count_blocks, format="csr") if self.count_blocks
+                                 else sp.csr_matrix((0, self.n_features), dtype=np.float32)]
+        return self.count_blocks[0]
+
+    def _term_frequencies(self, texts: Sequence[str]) -> sp.csr_matrix:
+        tf = self.vectorizer.transform(texts).tocsr()
+        np.log(tf.data, out=tf.data)
+        tf.data += 1
+        return tf
+
+    def _idf(self, documents: int) -> np.ndarray:
+        # Smoothed as in scikit-learn's TfidfTransformer
+        return (np.log((1 + documents) / (1 + self.df)) + 1).astype(np.float32)
+
+    @staticmethod
+    def _weigh(tf: sp.csr_matrix, idf: np.ndarray) -> sp.csr_matrix:
+        weighted = tf.multiply(idf).tocsr()
+        return normalize(weighted, copy=False)
+
+    def queue(self, documents: Iterable[Tuple[int, str]]):
+        """Schedule (candidate_id, text) pairs for indexing; cheap enough to call from commit hooks"""
+        documents = [(candidate_id, text) for candidate_id, text in documents if text]
+        if documents:
+            with self._pending_lock:
+                self._pending.extend(documents)
+
+    def flush_pending(self):
+        with self._pending_lock:
+            documents, self._pending = self._pending, []
+        if documents:
+            self.add([candidate_id for candidate_id, _ in documents], [text for _, text in documents])
+
+    def add(self, candidate_ids: Sequence[int], texts: Sequence[str]):
+        """Index new CVs; IDs that are already indexed are skipped"""
+        with self._write_lock:
+            snapshot = self._snapshot
+            ids = np.asarray(candidate_ids, dtype=np.int64)
+            keep = np.zeros(len(ids), dtype=bool)
+            keep[np.unique(ids, return_index=True)[1]] = True
+            keep &= ~np.isin(ids, snapshot.ids)
+            if not keep.any():
+                return
+            ids = ids[keep]
+            tf = self._term_frequencies([text for text, kept in zip(texts, keep) if kept])
+
+            self.count_blocks.append(tf)
+            if len(self.count_blocks) > MAX_BLOCKS:
+                self._counts()
+            np.add.at(self.df, tf.indices, 1)
+            self.dirty = True
+
+            all_ids = np.concatenate([snapshot.ids, ids])
+            if len(all_ids) > self.reweighted_at * (1 + self.reweight_growth):
+                self._reweight(all_ids)
+                return
+            blocks = snapshot.blocks + (self._weigh(tf, snapshot.idf),)
+            if len(blocks) > MAX_BLOCKS:
+                blocks = (sp.vstack(blocks, format="csr"),)
+            self._snapshot = _Snapshot(all_ids, blocks, snapshot.idf)
+
+    def _reweight(self, ids: np.ndarray):
+        counts = self._counts()
+        idf = self._idf(counts.shape[0])
+        self._snapshot = _Snapshot(ids, (self._weigh(counts, idf),), idf)
+        self.reweighted_at = counts.shape[0]
+
+    def top_k(self, text: str, k: int, candidate_ids: Optional[Sequence[int]] = None) -> List[Tuple[int, float]]:
+        """The k indexed CVs most similar to `text` as (candidate_id, cosine similarity), best first.
+
+        candidate_ids restricts the search to those candidates; CVs sharing no
+        terms with the text are never returned.
+        """
+        self.flush_pending()
+        snapshot = self._snapshot
+        query = self._weigh(self._term_frequencies([text]), snapshot.idf)
+        if query.nnz == 0 or k <= 0:
+            return []
+
+        ids = snapshot.ids
+        if len(ids) == 0:
+            return []
+        dense_query = query.toarray().ravel()
+        scores = np.concatenate([block @ dense_query for block in snapshot.blocks])
+        if candidate_ids is not None:
+            rows = np.flatnonzero(np.isin(ids, np.asarray(candidate_ids, dtype=np.int64)))
+            ids, scores = ids[rows], scores[rows]
+            if len(ids) == 0:
+                return []
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((ids[top], -scores[top]))]
+        return [(int(ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def save(self, path: str):
+        """Write the counts and document frequencies atomically (weights are recomputed on load)"""
+        with self._write_lock:
+            tmp_path = f"{path}.tmp"
+            counts = self._counts()
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f, n_features=self.n_features, ids=self._snapshot.ids, df=self.df,
+                    data=counts.data, indices=counts.indices, indptr=counts.indptr
+                )
+            os.replace(tmp_path, path)
+            self.dirty = False
+
+    def load(self, path: str) -> bool:
+        """Replace the index with one saved by save(); False if there is none or it is incompatible"""
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as saved:
+            if int(saved["n_features"]) != self.n_features:
+                return False
+            ids = saved["ids"]
+            counts = sp.csr_matrix((saved["data"], saved["indices"], saved["indptr"]),
+                                   shape=(len(ids), self.n_features))
+            df = saved["df"]
+        with self._write_lock:
+            self.count_blocks, self.df = [counts], df
+            self._reweight(ids)
+            self.dirty = False
+        return True
@@ -0,0 +1,121 @@
+"""
+Single-pass multi-pattern skill matching (Aho-Corasick)
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+_SPACE_RUN = re.compile(r" {2,}")
+
+
+class SkillMatch(NamedTuple):
+    skill_id: str
+    start: int
+    end: int
+
+
+class SkillMatcher:
+    """Compiled automaton that finds every skill of a vocabulary in one pass over a text.
+
+    The vocabulary maps a canonical skill ID to its surface forms. Matching is
+    case-insensitive, treats any whitespace as a single space and respects word
+    boundaries, so "Go" does not fire inside "Google" and "R" not inside "React".
+    """
+
+    def __init__(self, vocabulary: Dict[str, Iterable[str]]):
+        self.skill_ids = list(vocabulary)
+        self._order = {skill_id: index for index, skill_id in enumerate(self.skill_ids)}
+
+        # Trie nodes: transitions, failure link and (skill_id, length, check_start, check_end) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[tuple]] = [[]]
+
+        for skill_id, aliases in vocabulary.items():
+            for alias in aliases:
+                pattern, _ = self._fold(alias.strip())
+                if pattern:
+                    self._add_pattern(pattern, skill_id)
+
+        self._build_failure_links()
+
+    @staticmethod
+    def _fold(text: str) -> Tuple[str, Optional[List[int]]]:
+        """Lower-case and collapse whitespace runs to a single space.
+
+        Returns the folded text and, when runs were collapsed, the offset in the
+        original text of each folded character (None means offsets are unchanged).
+        """
+        folded = text.lower()
+        if len(folded) != len(text):
+            folded = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+        folded = "".join(" " if c.isspace() else c for c in folded)
+        if "  " not in folded:
+            return folded, None
+
+        pieces, offsets, position = [], [], 0
+        for run in _SPACE_RUN.finditer(folded):
+            pieces.append(folded[position:run.start() + 1])
+            offsets.extend(range(position, run.start() + 1))
+            position = run.end()
+        pieces.append(folded[position:])
+        offsets.extend(range(position, len(folded)))
+        return "".join(pieces), offsets
+
+    def _add_pattern(self, pattern: str, skill_id: str):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+
+        # Boundaries only matter where the pattern itself starts/ends with a word character
+        self._output[state].append((skill_id, len(pattern), pattern[0].isalnum(), pattern[-1].isalnum()))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> List[SkillMatch]:
+        """Return every word-bounded skill occurrence with its character offsets"""
+        folded, offsets = self._fold(text)
+        length = len(folded)
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+
+        state = 0
+        for index, char in enumerate(folded):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for skill_id, size, check_start, check_end in output[state]:
+                start, end = index - size + 1, index + 1
+                if check_start and start > 0 and folded[start - 1].isalnum():
+                    continue
+                if check_end and end < length and folded[end].isalnum():
+                    continue
+                if offsets is not None:
+                    start, end = offsets[start], offsets[end - 1] + 1
+                matches.append(SkillMatch(skill_id, start, end))
+
+        return matches
+
+    def find_skills(self, text: str) -> List[str]:
+        """Return the distinct skill IDs found in the text, in vocabulary order"""
+        found = {match.skill_id for match in self.find_all(text)}
+        return sorted(found, key=self._order.__getitem__)
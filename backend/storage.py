@@ -0,0 +1,118 @@
+"""
+Database engine configuration.
+
+DATABASE_URL selects the database (SQLite file by default, or any server
+URL SQLAlchemy supports). The "tuned" storage profile runs SQLite in WAL
+mode with the pragmas below on every pooled connection so readers no longer
+block behind writers; "default" keeps SQLite's stock settings.
+
+The API's request handlers use the async engine (aiosqlite for SQLite);
+background workers, migrations and scripts use the synchronous one.
+"""
+
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./recruitment.db")
+STORAGE_PROFILE = os.getenv("STORAGE_PROFILE", "tuned")  # tuned, default
+
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative means KiB, so 64 MiB
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Async driver used when DATABASE_URL names a synchronous one (or none)
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+def sqlite_pragmas() -> dict:
+    return {
+        "journal_mode": SQLITE_JOURNAL_MODE,
+        "synchronous": SQLITE_SYNCHRONOUS,
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "cache_size": SQLITE_CACHE_SIZE,
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": SQLITE_TEMP_STORE,
+    }
+
+
+def _apply_sqlite_pragmas(engine: Engine, pragmas: dict):
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _engine_options(url: URL, profile: str) -> dict:
+    """Pool and connection arguments for a database URL under a storage profile"""
+    if profile not in ("tuned", "default"):
+        raise ValueError(f"Unknown storage profile: {profile}")
+
+    if url.get_backend_name() != "sqlite":
+        return {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": True
+        }
+
+    options = {"connect_args": {"check_same_thread": False}}
+    # In-memory databases have no journal to tune and need SQLAlchemy's single-connection pool
+    if profile == "tuned" and url.database not in (None, "", ":memory:"):
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    return options
+
+
+def _tune_sqlite(url: URL, profile: str) -> bool:
+    return url.get_backend_name() == "sqlite" and profile == "tuned" and url.database not in (None, "", ":memory:")
+
+
+def create_database_engine(url: str = DATABASE_URL, profile: str = STORAGE_PROFILE) -> Engine:
+    """Create the engine for a database URL using the given storage profile"""
+    parsed = make_url(url)
+    engine = create_engine(url, **_engine_options(parsed, profile))
+    if _tune_sqlite(parsed, profile):
+        _apply_sqlite_pragmas(engine, sqlite_pragmas())
+    return engine
+
+
+def async_database_url(url: str) -> URL:
+    """Switch a database URL to its async driver, e.g. sqlite:// to sqlite+aiosqlite://"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend in ASYNC_DRIVERS and parsed.get_driver_name() != ASYNC_DRIVERS[backend]:
+        parsed = parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return parsed
+
+
+def create_async_database_engine(url: str = DATABASE_URL, profile: str = STORAGE_PROFILE) -> AsyncEngine:
+    """Async counterpart of create_database_engine, with the same pool sizing and pragmas"""
+    parsed = async_database_url(url)
+    options = _engine_options(parsed, profile)
+    if _tune_sqlite(parsed, profile):
+        # aiosqlite defaults to opening a connection per checkout; pool them like the sync engine
+        options["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(parsed, **options)
+    if _tune_sqlite(parsed, profile):
+        _apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas())
+    return engine
@@ -45,7 +45,7 @@ def test_candidates(token):
     response = requests.get(f"{BASE_URL}/candidates", headers=headers)
     
     if response.status_code == 200:
-        data = response.json()
+        data = response.json()["items"]
         print(f"✅ Retrieved {len(data)} candidates")
         if data:
             print(f"Top candidate: {data[0]['name']} ({data[0]['overall_score']:.1f}%)")
@@ -67,6 +67,30 @@ def test_job_positions(token):
         print("❌ Job positions retrieval failed")
         print(response.text)
 
+def test_interview_conflict(token):
+    """Test that re-posting a booked interview slot is rejected (run after database_init.py)"""
+    headers = {"Authorization": f"Bearer {token}"}
+    response = requests.get(f"{BASE_URL}/interviews", params={"limit": 100}, headers=headers)
+    booked = [i for i in response.json()["items"] if i["status"] != "cancelled"] if response.status_code == 200 else []
+    if not booked:
+        print("❌ No booked interview to re-post")
+        print(response.text)
+        return
+    
+    slot = booked[0]
+    response = requests.post(f"{BASE_URL}/interviews", json={
+        "candidate_id": 5 if slot["candidate_id"] != 5 else 4,
+        "interviewer_id": slot["interviewer_id"],
+        "scheduled_date": slot["scheduled_date"],
+        "duration": 60
+    }, headers=headers)
+    
+    if response.status_code == 409:
+        print("✅ Double booking rejected")
+    else:
+        print(f"❌ Double booking not rejected (status {response.status_code})")
+        print(response.text)
+
 def test_ai_chat(token):
     """Test AI chatbot"""
     headers = {"Authorization": f"Bearer {token}"}
@@ -100,6 +124,8 @@ def main():
     print()
     test_job_positions(token)
     print()
+    test_interview_conflict(token)
+    print()
     test_ai_chat(token)
     
     print("\n" + "=" * 50)